@@ -6,4 +6,8 @@ class AccountsConfig(AppConfig):
     name = 'accounts'
 
     def ready(self):
-        import accounts.signals
\ No newline at end of file
+        import accounts.signals
+        from django.contrib.auth.signals import user_logged_in
+
+        # last_login은 로그인마다 UPDATE하지 않고 accounts.signals.buffer_last_login에서 write-behind로 반영
+        user_logged_in.disconnect(dispatch_uid="update_last_login")
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+프로필 이미지 썸네일 (WebP)
+업로드 후 Celery 작업에서 settings.PROFILE_IMAGE_VARIANT_SIZES 크기의 정사각형 썸네일을 만들고
+Profile.image_variants = {"source": 원본 파일 이름, "sizes": {"64": 저장 경로, ...}} 로 기록
+"""
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+
+def get_variant_name(image_name, size):
+    root, _ = os.path.splitext(image_name)
+    return f"{root}_{size}.webp"
+
+
+def generate_image_variants(image_name, sizes=None):
+    """
+    원본을 한 번만 열어 큰 크기부터 차례로 줄여가며 저장하고 {크기: 저장 경로} 반환
+    """
+    sizes = sorted(sizes or settings.PROFILE_IMAGE_VARIANT_SIZES, reverse=True)
+    with default_storage.open(image_name, "rb") as f:
+        image = ImageOps.exif_transpose(Image.open(f))
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+    variants = {}
+    for size in sizes:
+        image = ImageOps.fit(image, (size, size), Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, "WEBP", quality=settings.PROFILE_IMAGE_VARIANT_QUALITY, method=4)
+        name = get_variant_name(image_name, size)
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        variants[str(size)] = default_storage.save(name, ContentFile(buffer.getvalue()))
+    return variants
+
+
+def delete_image_variants(image_variants):
+    for name in image_variants.get("sizes", {}).values():
+        default_storage.delete(name)
+
+
+def get_image_url(profile, size, request=None):
+    """
+    size 이상인 가장 작은 썸네일의 URL (아직 없거나 원본이 바뀌었으면 원본 URL)
+    """
+    return get_variant_url(profile.image.name, profile.image_variants, size, request)
+
+
+def get_variant_url(image_name, image_variants, size, request=None):
+    """
+    get_image_url을 Profile 인스턴스 없이 (values()로 읽은 image, image_variants로) 계산
+    """
+    if not image_name:
+        return None
+
+    variants = image_variants or {}
+    url = None
+    if variants.get("source") == image_name:
+        fits = [int(width) for width in variants.get("sizes", {}) if int(width) >= size]
+        if fits:
+            url = default_storage.url(variants["sizes"][str(min(fits))])
+    if url is None:
+        url = default_storage.url(image_name)
+    return request.build_absolute_uri(url) if request is not None else url
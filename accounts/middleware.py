@@ -0,0 +1,92 @@
+"""
+요청마다 세션 조회 후 User, Profile을 각각 SELECT하지 않도록
+user + profile(select_related)을 캐시에 짧게 저장해 두고 request.user로 제공
+User/Profile이 저장/삭제되면 accounts.signals에서 캐시를 지움
+"""
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model, load_backend
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+
+def get_user_cache_key(user_id):
+    return f"auth_user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(get_user_cache_key(user_id))
+
+
+def _get_user(user_id, backend):
+    """
+    캐시에 있으면 캐시에서, 없으면 profile까지 한 번의 쿼리로 읽어 캐시에 저장
+    """
+    key = get_user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = get_user_model().objects.select_related("profile").filter(pk=user_id).first()
+        if user is None:
+            return None
+        cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+    if hasattr(backend, "user_can_authenticate") and not backend.user_can_authenticate(user):
+        return None
+    return user
+
+
+def get_cached_user(request):
+    """
+    django.contrib.auth.get_user와 같은 검증(backend, 세션 해시)을 거치되 user는 캐시에서 읽음
+    """
+    try:
+        user_id = get_user_model()._meta.pk.to_python(request.session[SESSION_KEY])
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except KeyError:
+        return AnonymousUser()
+
+    if backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return AnonymousUser()
+
+    user = _get_user(user_id, load_backend(backend_path))
+    if user is None:
+        return AnonymousUser()
+
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    if not (session_hash and constant_time_compare(session_hash, user.get_session_auth_hash())):
+        if session_hash and any(
+            constant_time_compare(session_hash, fallback_hash) for fallback_hash in user.get_session_auth_fallback_hash()
+        ):
+            request.session.cycle_key()
+            request.session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        else:
+            request.session.flush()
+            return AnonymousUser()
+
+    user.backend = backend_path
+    return user
+
+
+def _get_request_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = get_cached_user(request)
+    return request._cached_user
+
+
+async def _aget_request_user(request):
+    return await sync_to_async(_get_request_user)(request)
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    django.contrib.auth.middleware.AuthenticationMiddleware 대체
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: _get_request_user(request))
+        request.auser = partial(_aget_request_user, request)
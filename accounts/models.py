@@ -103,6 +103,7 @@ class Profile(models.Model):
     image = models.ImageField(upload_to=profile_upload_url)
     nickname = models.CharField(max_length=30, unique=True)
     role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    image_variants = models.JSONField(default=dict, blank=True)  # WebP 썸네일 (accounts.images 참고)
 
     def save(self, *args, **kwargs):
         # nickname이 설정되지 않은 경우 email 앞부분을 기본값으로 설정
@@ -1,7 +1,24 @@
+from django.conf import settings
 from rest_framework import serializers
+
+from accounts.images import get_image_url
 from accounts.models import User, Profile
 
 
+class ProfileImageField(serializers.Field):
+    """
+    Profile의 썸네일 중 size 이상인 가장 작은 것의 URL (source는 Profile)
+    """
+
+    def __init__(self, size, **kwargs):
+        self.size = size
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, profile):
+        return get_image_url(profile, self.size, self.context.get("request"))
+
+
 class SignupSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
@@ -30,11 +47,18 @@ class UserSerializer(serializers.ModelSerializer):
 
 class ProfileSerializer(serializers.ModelSerializer):
     user = UserSerializer()
+    image_variants = serializers.SerializerMethodField()
 
     class Meta:
         model=Profile
         fields='__all__'
 
+    def get_image_variants(self, obj):
+        return {
+            size: get_image_url(obj, size, self.context.get("request"))
+            for size in settings.PROFILE_IMAGE_VARIANT_SIZES
+        }
+
     def __init__(self, *args, **kwargs):
         super(ProfileSerializer, self).__init__(*args, **kwargs)
         
@@ -46,6 +70,7 @@ class ProfileSerializer(serializers.ModelSerializer):
 class AuthorSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(source='user.email', read_only=True)
     phone_number = serializers.CharField(source='user.phone_number', read_only=True)
+    image = ProfileImageField(size=settings.AUTHOR_IMAGE_SIZE, source='*')
     
     class Meta:
         model = Profile
@@ -1,6 +1,10 @@
 import json
-from django.db.models.signals import post_migrate, post_save
+import time
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.conf import settings
+from django.db import transaction
+from django.contrib.auth.signals import user_logged_in
+from .middleware import invalidate_cached_user
 from .models import Profile
 from django.dispatch import receiver
 from django_celery_beat.models import PeriodicTask, IntervalSchedule
@@ -10,6 +14,32 @@ def create_user_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
 
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
+
+@receiver(post_save, sender=Profile)
+def request_profile_image_variants(sender, instance, **kwargs):
+    """ 이미지가 새로 올라오면 커밋 후 썸네일 생성 작업 요청 """
+    from .tasks import generate_profile_image_variants
+
+    image_name = instance.image.name
+    if image_name and (instance.image_variants or {}).get("source") != image_name:
+        transaction.on_commit(lambda: generate_profile_image_variants.delay(instance.id, image_name))
+
+@receiver(user_logged_in, dispatch_uid="accounts.buffer_last_login")
+def buffer_last_login(sender, request, user, **kwargs):
+    """ 모든 로그인(admin, 세션 등)의 last_login을 write-behind 버퍼에 기록 """
+    from .tasks import last_login_buffer
+
+    last_login_buffer.add(user.pk, time.time())
+
 @receiver(post_migrate)
 def create_batch_update_last_login(sender, **kwargs):
     if sender.name == "django_celery_beat":
@@ -1,25 +1,61 @@
+from datetime import datetime, timezone
+
 from celery import shared_task
 from django.utils.timezone import now
 
 from django.contrib.auth import get_user_model
-import redis
+from accounts.images import delete_image_variants, generate_image_variants
+from accounts.middleware import invalidate_cached_user
+from accounts.models import Profile
+from core.cache import bump_generation
+from core.write_behind import WriteBehindBuffer
 
-redis_client = redis.StrictRedis(host="redis", port=6379, db=0)
 User = get_user_model()
 
 
+def _flush_last_login(items):
+    """ [(user_id, 로그인 시각 timestamp), ...] -> last_login 일괄 반영 """
+    User.objects.bulk_update(
+        [User(id=int(user_id), last_login=datetime.fromtimestamp(float(ts), tz=timezone.utc)) for user_id, ts in items],
+        ["last_login"],
+    )
+
+
+# 로그인 시 Redis에 (user_id -> 로그인 시각)만 기록하고 batch_update_last_login에서 반영
+last_login_buffer = WriteBehindBuffer("last_login", _flush_last_login, kind="latest")
+
+
 @shared_task
 def batch_update_last_login(user_ids=[]):
     """ 여러 사용자의 last_login을 한 번에 업데이트 (Batch 처리) """
-    if not user_ids:
-        user_ids = redis_client.smembers("recent_logins")  
-        user_ids = [int(uid) for uid in user_ids]
+    if user_ids:
+        User.objects.filter(id__in=user_ids).update(last_login=now())
+        return f"Updated last_login for users: {user_ids}"
 
-    if not user_ids:
+    updated = last_login_buffer.flush()
+    if not updated:
         return "No users to update."
-    
-    User.objects.filter(id__in=user_ids).update(last_login=now())
+    return f"Updated last_login for {updated} users"
+
+
+@shared_task
+def generate_profile_image_variants(profile_id, image_name):
+    """ 업로드된 프로필 이미지의 WebP 썸네일 생성 """
+    profile = Profile.objects.filter(id=profile_id, image=image_name).first()
+    if profile is None:
+        return "Image changed or profile deleted."
+
+    previous = profile.image_variants or {}
+    variants = {"source": image_name, "sizes": generate_image_variants(image_name)}
+
+    # save() 대신 update()로 저장해 post_save(썸네일 생성 요청)가 다시 발생하지 않도록 함
+    # 그 사이 이미지가 바뀌었다면 반영하지 않음
+    if not Profile.objects.filter(id=profile_id, image=image_name).update(image_variants=variants):
+        delete_image_variants(variants)
+        return "Image changed during processing."
 
-    for user_id in user_ids:
-        redis_client.srem("recent_logins", user_id)
-    return f"Updated last_login for users: {user_ids}"
\ No newline at end of file
+    if previous.get("source") != image_name:
+        delete_image_variants(previous)
+    invalidate_cached_user(profile.user_id)
+    bump_generation(Profile)  # 작성자 이미지가 포함된 이벤트 응답 캐시 갱신
+    return f"Generated {len(variants['sizes'])} variants for profile {profile_id}"
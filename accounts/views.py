@@ -10,9 +10,6 @@ from rest_framework.permissions import IsAuthenticated
 
 from accounts.serializers import SignupSerializer, LoginSerializer, ProfileSerializer
 from accounts.models import Profile, User
-import redis
-
-redis_client = redis.StrictRedis(host="redis", port=6379, db=0)
 
 
 class SignupView(APIView):
@@ -38,8 +35,6 @@ class LoginView(APIView):
 
             login(request, user)
 
-            redis_client.sadd("recent_logins", user.id)
-
             return Response({"message": "로그인 성공"}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -57,7 +52,7 @@ class ProfileView(APIView):
 
     def get(self, request):
         try:
-            profile = Profile.objects.get(user=request.user)
+            profile = request.user.profile  # 인증 미들웨어가 캐시해 둔 profile
         except Profile.DoesNotExist:
             return Response({"detail": "Profile not found."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -66,7 +61,7 @@ class ProfileView(APIView):
 
     def post(self, request):
         try:
-            profile = Profile.objects.get(user=request.user)
+            profile = request.user.profile  # 인증 미들웨어가 캐시해 둔 profile
         except Profile.DoesNotExist:
             return Response({"detail": "Profile not found."}, status=status.HTTP_404_NOT_FOUND)
 
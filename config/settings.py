@@ -72,11 +72,13 @@ if DEBUG:
     INSTALLED_APPS += ["debug_toolbar"]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.CachedAuthenticationMiddleware',
+    'core.middleware.LoadSheddingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -105,27 +107,115 @@ if DEBUG:
 WSGI_APPLICATION = 'config.wsgi.application'
 
 
+# Redis 용도(role)별 접속 정보 - 좌석 선점 폭주가 세션/브로커에 영향을 주지 않도록 DB를 분리
+REDIS_HOST = env.str("REDIS_HOST", "redis")
+REDIS_PORT = env.str("REDIS_PORT", "6379")
+
+REDIS_URLS = {
+    "broker": env.str("REDIS_BROKER_URL", default=f"redis://{REDIS_HOST}:{REDIS_PORT}/0"),
+    "cache": env.str("REDIS_CACHE_URL", default=f"redis://{REDIS_HOST}:{REDIS_PORT}/1"),
+    "sessions": env.str("REDIS_SESSIONS_URL", default=f"redis://{REDIS_HOST}:{REDIS_PORT}/2"),
+    "queue": env.str("REDIS_QUEUE_URL", default=f"redis://{REDIS_HOST}:{REDIS_PORT}/3"),
+    "holds": env.str("REDIS_HOLDS_URL", default=f"redis://{REDIS_HOST}:{REDIS_PORT}/4"),
+}
+
+REDIS_POOL_OPTIONS = {
+    "max_connections": env.int("REDIS_MAX_CONNECTIONS", default=100),
+    "socket_timeout": env.float("REDIS_SOCKET_TIMEOUT", default=5),
+    "socket_connect_timeout": env.float("REDIS_SOCKET_CONNECT_TIMEOUT", default=2),
+    "health_check_interval": env.int("REDIS_HEALTH_CHECK_INTERVAL", default=30),
+    "retry_on_timeout": True,
+}
+
+REDIS_PIPELINE_CHUNK_SIZE = env.int("REDIS_PIPELINE_CHUNK_SIZE", default=1000)
+
 # Redis를 세션 관리에 사용 
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
-SESSION_CACHE_ALIAS = "default"
+SESSION_CACHE_ALIAS = "sessions"
 
 # Redis를 캐시 저장소로 사용
 CACHES = {
     "default": {
         "BACKEND": "django_redis.cache.RedisCache",
-        "LOCATION": f"redis://{env.str('REDIS_HOST', 'redis')}:{env.str('REDIS_PORT', '6379')}/0",
+        "LOCATION": REDIS_URLS["cache"],
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CONNECTION_POOL_KWARGS": {"max_connections": REDIS_POOL_OPTIONS["max_connections"]},
         }
-    }
+    },
+    "sessions": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URLS["sessions"],
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "CONNECTION_POOL_KWARGS": {"max_connections": REDIS_POOL_OPTIONS["max_connections"]},
+        }
+    },
 }
 
+# 저장/삭제 시 응답 캐시 세대를 올릴 모델 (CacheResponseMixin 뷰의 cache_invalidate_models 합집합)
+CACHE_GENERATION_MODELS = ["accounts.Profile", "accounts.User", "events.Category", "events.Event", "events.Seat"]
+
 # Celery - Redis를 브로커로 사용
-CELERY_BROKER_URL = f"redis://{env.str('REDIS_HOST', 'redis')}:{env.str('REDIS_PORT', '6379')}/0"
-CELERY_RESULT_BACKEND = f"redis://{env.str('REDIS_HOST', 'redis')}:{env.str('REDIS_PORT', '6379')}/0"
+CELERY_BROKER_URL = REDIS_URLS["broker"]
+CELERY_RESULT_BACKEND = env.str("CELERY_RESULT_BACKEND", default=REDIS_URLS["broker"])
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 
+# SSE 대기열 연결 유지용 keepalive 주기 (초)
+SSE_KEEPALIVE = env.int("SSE_KEEPALIVE", default=15)
+
+# 대기열 입장 스케줄러 (events.admission)
+ADMISSION_RATE = env.float("ADMISSION_RATE", default=10)  # 초당 입장 인원 (기본값, 대기열별로 실시간 변경 가능)
+ADMISSION_BURST = env.float("ADMISSION_BURST", default=0)  # 한 번에 입장 가능한 최대 인원 (0이면 rate)
+ADMISSION_TICK = env.float("ADMISSION_TICK", default=0.2)  # 입장 처리 주기 (초)
+ADMISSION_TTL = env.int("ADMISSION_TTL", default=60 * 10)  # 입장 후 좌석 선택 가능 시간 (초)
+ADMISSION_REQUIRED = env.bool("ADMISSION_REQUIRED", default=False)  # 입장한 유저만 예매 가능
+
+# 좌석 선점 유지 시간 (초)
+SEAT_HOLD_TTL = env.int("SEAT_HOLD_TTL", default=60 * 10)
+SEAT_CONFIRM_TTL = env.int("SEAT_CONFIRM_TTL", default=60 * 60)  # 결제 확정 요청 후 consumer가 처리할 때까지 선점 유지 시간 (초)
+SEAT_HOLD_SWEEP_BATCH_SIZE = env.int("SEAT_HOLD_SWEEP_BATCH_SIZE", default=500)  # 만료 선점 해제 시 한 번에 처리할 좌석 수
+
+# 좌석 일괄 생성
+SEAT_BULK_CREATE_BATCH_SIZE = env.int("SEAT_BULK_CREATE_BATCH_SIZE", default=2000)
+SEAT_LAYOUT_MAX_SEATS = env.int("SEAT_LAYOUT_MAX_SEATS", default=100000)
+
+# 좌석 잔여 현황 bitmap/배치 캐시 유지 시간 (초)
+SEAT_AVAILABILITY_TTL = env.int("SEAT_AVAILABILITY_TTL", default=60 * 60)
+EVENT_INVENTORY_TTL = env.int("EVENT_INVENTORY_TTL", default=60 * 60)  # 잔여 좌석 카운터 유지 시간 (만료되면 조회 시 DB로 재계산)
+
+# 예약 확정 Kafka consumer 배치 처리
+RESERVATION_CONSUMER_BATCH = env.bool("RESERVATION_CONSUMER_BATCH", default=True)
+RESERVATION_CONSUMER_BATCH_SIZE = env.int("RESERVATION_CONSUMER_BATCH_SIZE", default=500)
+RESERVATION_CONSUMER_BATCH_TIMEOUT_MS = env.int("RESERVATION_CONSUMER_BATCH_TIMEOUT_MS", default=1000)
+RESERVATION_CONSUMER_WORKERS = env.int("RESERVATION_CONSUMER_WORKERS", default=1)  # 토픽 파티션 수 이하로 설정
+RESERVATION_CONSUMER_HEARTBEAT = env.int("RESERVATION_CONSUMER_HEARTBEAT", default=5)  # 상태/lag 기록 주기 (초)
+RESERVATION_CONSUMER_RETRY_DELAY = env.float("RESERVATION_CONSUMER_RETRY_DELAY", default=1.0)  # DB/Redis 장애 시 배치 재처리 간격 (초)
+
+# Kafka
+KAFKA_BOOTSTRAP_SERVERS = env.list("KAFKA_BOOTSTRAP_SERVERS", default=["kafka:19092"])
+KAFKA_ACKS = env.str("KAFKA_ACKS", default="all")
+KAFKA_PRODUCER = {
+    "acks": int(KAFKA_ACKS) if KAFKA_ACKS.isdigit() else KAFKA_ACKS,
+    "linger_ms": env.int("KAFKA_LINGER_MS", default=5),  # 배치를 모으기 위해 기다리는 최대 시간 (ms)
+    "batch_size": env.int("KAFKA_BATCH_SIZE", default=64 * 1024),  # 파티션별 배치 크기 (bytes)
+    "compression_type": env.str("KAFKA_COMPRESSION_TYPE", default=None),  # gzip / snappy / lz4 / zstd
+    "retries": env.int("KAFKA_RETRIES", default=5),
+    "max_in_flight_requests_per_connection": 1,  # 재시도 시에도 파티션 내 순서 유지
+}
+KAFKA_OUTBOX = env.bool("KAFKA_OUTBOX", default=False)  # 요청에서는 outbox 테이블에만 기록
+KAFKA_OUTBOX_BATCH_SIZE = env.int("KAFKA_OUTBOX_BATCH_SIZE", default=1000)
+KAFKA_OUTBOX_SEND_TIMEOUT = env.int("KAFKA_OUTBOX_SEND_TIMEOUT", default=10)  # relay 한 번의 전송 대기 시간 (초)
+
+# 메트릭 (/metrics)
+METRICS_ENABLED = env.bool("METRICS_ENABLED", default=True)
+METRICS_TOKEN = env.str("METRICS_TOKEN", default="")  # 수집기가 보낼 Bearer 토큰 (비어 있으면 staff 유저만 조회 가능)
+
+# write-behind 버퍼 (core.write_behind)
+WRITE_BEHIND_CHUNK_SIZE = env.int("WRITE_BEHIND_CHUNK_SIZE", default=1000)  # 한 번의 UPDATE에 반영할 항목 수
+WRITE_BEHIND_MAX_RETRIES = env.int("WRITE_BEHIND_MAX_RETRIES", default=5)
+
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
@@ -136,6 +226,13 @@ DATABASES = {"default": env.db(default=DEFAULT_DATABASE_URL),}
 
 # accounts
 AUTH_USER_MODEL = 'accounts.User'
+AUTH_USER_CACHE_TIMEOUT = env.int("AUTH_USER_CACHE_TIMEOUT", default=60)  # 요청 간 user + profile 캐시 유지 시간 (초)
+
+# 프로필 이미지 WebP 썸네일 (accounts.images)
+PROFILE_IMAGE_VARIANT_SIZES = env.list("PROFILE_IMAGE_VARIANT_SIZES", cast=int, default=[64, 128, 256])
+PROFILE_IMAGE_VARIANT_QUALITY = env.int("PROFILE_IMAGE_VARIANT_QUALITY", default=80)
+EVENT_LIST_AUTHOR_IMAGE_SIZE = env.int("EVENT_LIST_AUTHOR_IMAGE_SIZE", default=64)  # 이벤트 목록 작성자 이미지
+AUTHOR_IMAGE_SIZE = env.int("AUTHOR_IMAGE_SIZE", default=128)  # 이벤트 상세 작성자 이미지
 
 
 # Password validation
@@ -191,6 +288,78 @@ MEDIA_URL = env.str("MEDIA_URL", default="media/")
 
 MEDIA_ROOT = env.str("MEDIA_ROOT", default=BASE_DIR / "mediafiles")
 
+REST_FRAMEWORK = {
+    # orjson이 없으면 DRF 기본 JSON 구현으로 동작
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# 구매 경로 부하 차단 (core.load_shedding) - 워커 프로세스별 동시 처리 한도를 AIMD로 조절
+LOAD_SHEDDING = {
+    "ENABLED": env.bool("LOAD_SHEDDING_ENABLED", default=True),
+    # 적용할 (뷰, 액션) - POST 요청만 제한
+    "VIEWS": [("ReservationViewSet", "create"), ("TicketConfirmedView", "")],
+    "INITIAL_LIMIT": env.int("LOAD_SHEDDING_INITIAL_LIMIT", default=20),
+    "MIN_LIMIT": env.int("LOAD_SHEDDING_MIN_LIMIT", default=2),
+    "MAX_LIMIT": env.int("LOAD_SHEDDING_MAX_LIMIT", default=200),
+    "TARGET_LATENCY": env.float("LOAD_SHEDDING_TARGET_LATENCY", default=0.5),  # p95 목표 (초)
+    "WINDOW": env.int("LOAD_SHEDDING_WINDOW", default=100),  # 한도를 조절하는 완료 요청 수 단위
+    "INCREASE": env.int("LOAD_SHEDDING_INCREASE", default=2),
+    "DECREASE_FACTOR": env.float("LOAD_SHEDDING_DECREASE_FACTOR", default=0.7),
+    # 후행 지표 최대치 (넘으면 한도를 줄이고 503)
+    "MAX_BACKLOG": {
+        "consumer_lag": env.int("LOAD_SHEDDING_MAX_CONSUMER_LAG", default=10000),
+        "outbox": env.int("LOAD_SHEDDING_MAX_OUTBOX", default=10000),
+    },
+    "BACKLOG_CHECK_INTERVAL": env.float("LOAD_SHEDDING_BACKLOG_CHECK_INTERVAL", default=1.0),  # 초
+    "RETRY_AFTER": env.int("LOAD_SHEDDING_RETRY_AFTER", default=1),  # 429 응답의 Retry-After (초)
+    "BACKLOG_RETRY_AFTER": env.int("LOAD_SHEDDING_BACKLOG_RETRY_AFTER", default=5),  # 503 응답의 Retry-After (초)
+}
+
+# Idempotency-Key 헤더로 재시도된 예매/확정 요청의 응답 재사용 (core.idempotency)
+IDEMPOTENCY_TTL = env.int("IDEMPOTENCY_TTL", default=60 * 10)  # 응답 보관 시간 (초)
+IDEMPOTENCY_LOCK_TTL = env.int("IDEMPOTENCY_LOCK_TTL", default=30)  # 처리 중 표시 유지 시간 (초, 요청 처리 시간보다 길게)
+
+# 조회 액션(이벤트 목록/상세, 좌석 목록, 내 예매 내역)을 values() 프로젝션으로 직렬화 (core.mixins.ValuesSerializerMixin)
+FAST_SERIALIZERS = env.bool("FAST_SERIALIZERS", default=True)
+
+# 요청/응답 로그 (core.mixins.LoggerMixin)
+REQUEST_LOGGING = {
+    "DEFAULT_SAMPLE_RATE": env.float("REQUEST_LOG_SAMPLE_RATE", default=1.0),
+    # 액션별 샘플링 비율 (0 ~ 1)
+    "SAMPLE_RATES": {
+        "list": env.float("REQUEST_LOG_LIST_SAMPLE_RATE", default=0.1),
+    },
+    "MAX_PAYLOAD_LENGTH": env.int("REQUEST_LOG_MAX_PAYLOAD_LENGTH", default=1000),
+    "LOG_HEADERS": env.bool("REQUEST_LOG_HEADERS", default=False),
+    "STRUCTURED": env.bool("REQUEST_LOG_STRUCTURED", default=False),
+}
+
+# 로그 출력은 큐에 넣고 백그라운드 스레드에서 처리
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "queue": {
+            "()": "core.logging.QueueListenerHandler",
+            "stream": "ext://sys.stderr",
+            "structured": REQUEST_LOGGING["STRUCTURED"],
+            "fmt": "[%(asctime)s] %(levelname)s %(name)s %(message)s",
+        },
+    },
+    "loggers": {
+        "core": {"handlers": ["queue"], "level": env.str("LOG_LEVEL", default="INFO"), "propagate": False},
+        "events": {"handlers": ["queue"], "level": env.str("LOG_LEVEL", default="INFO"), "propagate": False},
+    },
+}
+
 # Django-Debug_toolbar 
 INTERNAL_IPS = [
     '127.0.0.1',
@@ -0,0 +1,392 @@
+"""
+구성 요소별 마이크로 벤치마크 (`manage.py benchmark`)
+Redis는 fakeredis(또는 설정된 Redis), Kafka는 InMemoryKafka로 대체해 오프라인에서 실행
+결과는 JSON으로 출력해 릴리스 간 비교 (`--compare 이전결과.json`)
+"""
+import json
+import platform
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict, namedtuple
+from datetime import datetime, timedelta
+
+import django
+from django.conf import settings
+from kafka import TopicPartition
+
+from core import redis as core_redis
+
+Record = namedtuple("Record", ["topic", "partition", "offset", "key", "value"])
+
+
+class _Future:
+    def add_callback(self, callback, *args):
+        callback(None, *args)
+        return self
+
+    def add_errback(self, errback, *args):
+        return self
+
+    def succeeded(self):
+        return True
+
+
+class InMemoryKafka:
+    """
+    파티션별 리스트로 동작하는 Kafka 대체품 (key 해시로 파티션 결정, offset은 리스트 인덱스)
+    """
+
+    def __init__(self, partitions=4):
+        self.partitions = partitions
+        self.topics = defaultdict(lambda: [[] for _ in range(self.partitions)])
+
+    def producer(self):
+        return InMemoryProducer(self)
+
+    def consumer(self, topic):
+        return InMemoryConsumer(self, topic)
+
+
+class InMemoryProducer:
+    def __init__(self, broker):
+        self.broker = broker
+
+    def send(self, topic, value=None, key=None):
+        partition = hash(str(key)) % self.broker.partitions
+        log = self.broker.topics[topic][partition]
+        log.append(Record(topic, partition, len(log), key, value))
+        return _Future()
+
+    def flush(self, timeout=None):
+        pass
+
+
+class InMemoryConsumer:
+    def __init__(self, broker, topic):
+        self.broker = broker
+        self.topic = topic
+        self.positions = [0] * broker.partitions
+        self.committed = list(self.positions)
+
+    def poll(self, timeout_ms=0, max_records=500):
+        records = {}
+        for partition, log in enumerate(self.broker.topics[self.topic]):
+            batch = log[self.positions[partition]:self.positions[partition] + max_records]
+            if batch:
+                records[TopicPartition(self.topic, partition)] = batch
+                self.positions[partition] += len(batch)
+                max_records -= len(batch)
+            if max_records <= 0:
+                break
+        return records
+
+    def seek(self, tp, offset):
+        self.positions[tp.partition] = offset
+
+    def commit(self):
+        self.committed = list(self.positions)
+
+
+def use_fake_redis():
+    """
+    모든 role의 Redis 클라이언트를 하나의 fakeredis 서버로 교체
+    """
+    import fakeredis
+
+    server = fakeredis.FakeServer()
+    for role in settings.REDIS_URLS:
+        for decode in (True, False):
+            core_redis._clients[(role, decode)] = fakeredis.FakeRedis(server=server, decode_responses=decode)
+
+
+def summarize(name, size, samples, **extra):
+    samples = sorted(samples)
+    total = sum(samples)
+
+    def percentile(p):
+        return round(samples[min(len(samples) - 1, int(len(samples) * p))] * 1e6, 1)
+
+    return {
+        "name": name,
+        "size": size,
+        "count": len(samples),
+        "ops_per_sec": round(len(samples) / total, 1) if total else None,
+        "mean_us": round(statistics.fmean(samples) * 1e6, 1),
+        "p50_us": percentile(0.50),
+        "p95_us": percentile(0.95),
+        "p99_us": percentile(0.99),
+        "max_us": round(samples[-1] * 1e6, 1),
+        **extra,
+    }
+
+
+def measure(func, repeat):
+    samples = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_queue(sizes, repeat):
+    """
+    대기열 입장 / 순번 조회 / 이탈 (대기 인원 size명 상태에서)
+    """
+    from events.queue_manager import add_user_to_queue, get_queue_key, get_queue_position, remove_user_from_queue
+
+    event_id = 1
+    queue_key = get_queue_key(event_id)
+    redis = core_redis.get_redis("queue")
+    results = []
+    for size in sizes:
+        redis.delete(queue_key, f"{queue_key}:seq")
+        for start in range(0, size, 10000):
+            redis.zadd(queue_key, {str(user_id): user_id for user_id in range(start, min(size, start + 10000))})
+        redis.set(f"{queue_key}:seq", size)
+
+        new_users = range(size, size + repeat)
+        existing = random.sample(range(size), min(size, repeat))
+        results.append(summarize("queue.enter", size, measure(lambda i: add_user_to_queue(new_users[i], event_id), repeat)))
+        results.append(summarize("queue.position", size, measure(lambda i: get_queue_position(existing[i % len(existing)], event_id), repeat)))
+        results.append(summarize("queue.leave", size, measure(lambda i: remove_user_from_queue(existing[i % len(existing)], event_id), repeat)))
+    redis.delete(queue_key, f"{queue_key}:seq")
+    return results
+
+
+def bench_seat_hold(seat_counts, repeat, threads=8, pool=64):
+    """
+    threads명이 pool개의 좌석 중 연속된 n석을 동시에 선점/해제 (충돌률 포함)
+    """
+    from events.seat_holds import hold_seats, release_seats
+
+    event_id = 1
+    results = []
+    for count in seat_counts:
+        samples, conflicts = [], []
+
+        def worker(user_id):
+            for _ in range(repeat // threads or 1):
+                start = random.randrange(pool - count + 1)
+                ticket_ids = list(range(start, start + count))
+                started = time.perf_counter()
+                conflicted = hold_seats(event_id, ticket_ids, user_id)
+                samples.append(time.perf_counter() - started)
+                conflicts.append(bool(conflicted))
+                if not conflicted:
+                    release_seats(event_id, ticket_ids, user_id)
+
+        workers = [threading.Thread(target=worker, args=(user_id,)) for user_id in range(1, threads + 1)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        results.append(
+            summarize("seat.hold", count, samples, threads=threads, conflict_rate=round(sum(conflicts) / len(conflicts), 3))
+        )
+    return results
+
+
+def _create_user():
+    from accounts.models import User
+
+    return User.objects.filter(email="bench@example.com").first() or User.objects.create_user(
+        "bench@example.com", "benchmark", name="bench", phone_number="01000000000", birthday="2000-01-01"
+    )
+
+
+def _create_event(user, seats):
+    """
+    좌석 seats개를 가진 이벤트를 새로 만들고 (event, 좌석 id 목록) 반환
+    """
+    from accounts.models import Profile
+    from events.models import Category, Event, Seat
+
+    today = datetime.now().date()
+    event = Event.objects.create(
+        category=Category.objects.get_or_create(name="bench")[0],
+        author=Profile.objects.get(user=user),
+        title="bench",
+        period_start=today,
+        period_end=today + timedelta(days=30),
+        price=1,
+        event_date=today + timedelta(days=60),
+        content="bench",
+    )
+    Seat.objects.bulk_create(
+        [Seat(event=event, position=f"A-{number}") for number in range(seats)],
+        batch_size=settings.SEAT_BULK_CREATE_BATCH_SIZE,
+    )
+    return event, list(Seat.objects.filter(event=event).order_by("id").values_list("id", flat=True))
+
+
+def bench_seat_list(user, sizes, repeat):
+    """
+    좌석 목록 직렬화 + JSON 렌더링 (좌석 size개)
+    """
+    from rest_framework.renderers import JSONRenderer
+
+    from events.models import Seat
+    from events.serializers import SeatSerializers
+
+    results = []
+    for size in sizes:
+        event, _ = _create_event(user, size)
+
+        def render(i):
+            data = SeatSerializers(Seat.objects.filter(event=event), many=True).data
+            JSONRenderer().render(data)
+
+        results.append(summarize("seat.list", size, measure(render, repeat)))
+    return results
+
+
+def _create_events(user, count):
+    from accounts.models import Profile
+    from events.models import Category, Event
+
+    today = datetime.now().date()
+    category = Category.objects.get_or_create(name="bench")[0]
+    author = Profile.objects.get(user=user)
+    Event.objects.bulk_create([
+        Event(
+            category=category, author=author, title=f"bench {number}", period_start=today,
+            period_end=today + timedelta(days=30), price=1, event_date=today + timedelta(days=60), content="bench",
+        )
+        for number in range(count)
+    ])
+    return Event.objects.filter(author=author).order_by("-id")[:count]
+
+
+def bench_render(user, sizes, repeat):
+    """
+    조회 fast path (values() 프로젝션 + orjson) vs 기존 ModelSerializer + JSONRenderer
+    이벤트 목록/좌석 목록 size행을 조회부터 JSON 렌더링까지 측정해 rows/sec 비교
+    """
+    from rest_framework.renderers import JSONRenderer
+
+    from core.renderers import ORJSONRenderer
+    from events.models import Event, Seat
+    from events.serializers import EventListSerializers, EventListValuesSerializer, SeatSerializers, SeatValuesSerializer
+
+    results = []
+    for size in sizes:
+        event, _ = _create_event(user, size)
+        event_ids = [event.id for event in _create_events(user, size)]
+        targets = {
+            "event_list": (
+                lambda: Event.objects.filter(id__in=event_ids).select_related("author", "author__user", "category"),
+                EventListSerializers,
+                EventListValuesSerializer,
+            ),
+            "seat_list": (lambda: Seat.objects.filter(event=event), SeatSerializers, SeatValuesSerializer),
+        }
+        for target, (get_queryset, serializer_class, values_serializer_class) in targets.items():
+            paths = {
+                "drf": lambda i: JSONRenderer().render(serializer_class(get_queryset(), many=True).data),
+                "fast": lambda i: ORJSONRenderer().render(
+                    values_serializer_class(values_serializer_class.project(get_queryset()), many=True).data
+                ),
+            }
+            rows_per_sec = {}
+            for path, render in paths.items():
+                samples = measure(render, repeat)
+                rows_per_sec[path] = round(size * repeat / sum(samples), 1)
+                results.append(summarize(f"render.{target}.{path}", size, samples, rows_per_sec=rows_per_sec[path]))
+            results[-1]["speedup"] = round(rows_per_sec["fast"] / rows_per_sec["drf"], 2)
+    return results
+
+
+def bench_consumer(user, batch_sizes, repeat):
+    """
+    선점된 좌석의 확정 메시지 batch개를 InMemoryKafka에서 읽어 한 번에 확정
+    """
+    from core import producer
+    from core.consumers import confirm_reservations
+    from events.seat_holds import get_seat_key, hold_seats
+
+    broker = InMemoryKafka()
+    producer._producer = broker.producer()
+    results = []
+    for batch in batch_sizes:
+        event, ticket_ids = _create_event(user, batch * repeat)
+        consumer = broker.consumer("seat_reservation")
+        consumer.poll(max_records=10 ** 9)  # 이전 배치 크기의 메시지 건너뛰기
+        expiration_time = (datetime.now() + timedelta(hours=1)).isoformat()
+
+        def confirm(i):
+            polled = consumer.poll(max_records=batch)
+            confirm_reservations([record.value for records in polled.values() for record in records])
+            consumer.commit()
+
+        for i in range(repeat):
+            chunk = ticket_ids[i * batch:(i + 1) * batch]
+            hold_seats(event.id, chunk, user.id)
+            producer.enqueue(
+                "seat_reservation",
+                [
+                    {"seat_key": get_seat_key(event.id, ticket_id), "event_id": event.id, "ticket_id": ticket_id, "user_id": user.id, "status": "confirmed", "expiration_time": expiration_time}
+                    for ticket_id in chunk
+                ],
+                key=event.id,
+            )
+
+        samples = measure(confirm, repeat)
+        results.append(
+            summarize("consumer.confirm_batch", batch, samples, messages_per_sec=round(batch * repeat / sum(samples), 1))
+        )
+    return results
+
+
+def run(suites, sizes, repeat):
+    """
+    suites 중 선택한 벤치마크를 실행하고 결과 dict 반환
+    sizes = {"queue": [...], "seat_hold": [...], "seat_list": [...], "render": [...], "consumer": [...]}
+    """
+    results = []
+    if "queue" in suites:
+        results += bench_queue(sizes["queue"], repeat)
+    if "seat_hold" in suites:
+        results += bench_seat_hold(sizes["seat_hold"], repeat)
+    if {"seat_list", "render", "consumer"} & set(suites):
+        user = _create_user()
+        if "seat_list" in suites:
+            results += bench_seat_list(user, sizes["seat_list"], max(1, repeat // 100))
+        if "render" in suites:
+            results += bench_render(user, sizes["render"], max(1, repeat // 100))
+        if "consumer" in suites:
+            results += bench_consumer(user, sizes["consumer"], max(1, repeat // 100))
+
+    return {
+        "meta": {
+            "time": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(previous, current):
+    """
+    같은 (name, size)끼리 p50 변화율(%) 목록 반환 (양수면 느려짐)
+    """
+    before = {(result["name"], result["size"]): result for result in previous["results"]}
+    changes = []
+    for result in current["results"]:
+        old = before.get((result["name"], result["size"]))
+        if old and old["p50_us"]:
+            changes.append({
+                "name": result["name"],
+                "size": result["size"],
+                "p50_us": [old["p50_us"], result["p50_us"]],
+                "change_pct": round((result["p50_us"] - old["p50_us"]) / old["p50_us"] * 100, 1),
+            })
+    return changes
+
+
+def dumps(data):
+    return json.dumps(data, indent=2, ensure_ascii=False)
@@ -0,0 +1,37 @@
+"""
+모델 단위 캐시 세대(generation) 카운터
+모델이 저장/삭제될 때마다 세대를 올리고, 응답 캐시 키에 세대를 포함시켜
+이전 세대의 캐시는 자연스럽게 무효화 (TTL로 정리)
+"""
+from django.core.cache import cache
+
+
+def get_model_label(model):
+    if isinstance(model, str):
+        return model.lower()
+    return model._meta.label_lower
+
+
+def get_generation_key(model):
+    return f"cache_gen:{get_model_label(model)}"
+
+
+def get_generations(models):
+    """
+    모델 목록의 현재 세대를 한 번에 조회 (순서 유지)
+    """
+    keys = [get_generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    return [generations.get(key, 0) for key in keys]
+
+
+def bump_generation(*models):
+    """
+    bulk_create / update 처럼 시그널이 발생하지 않는 쓰기 이후에 직접 호출
+    """
+    for model in models:
+        key = get_generation_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
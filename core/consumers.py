@@ -1,13 +1,21 @@
 # app/kafka_consumer.py
+from collections import defaultdict
 from datetime import datetime
 from kafka import KafkaConsumer
 import json
-import redis
+import logging
+import os
+import socket
+import time
+from core.redis import get_redis, pipelined
 from events.queue_manager import add_user_to_queue
+from events.seat_holds import clear_confirmed_holds
 from events.models import Reservation, Seat
-from django.db import transaction
+from django.conf import settings
+from django.db import IntegrityError, InterfaceError, OperationalError, transaction
+from redis.exceptions import RedisError
 
-redis_client = redis.StrictRedis(host="redis", port=6379, db=0, decode_responses=True)
+logger = logging.getLogger(__name__)
 
 def kafka_consumer_task(game_id):
     """
@@ -15,11 +23,11 @@ def kafka_consumer_task(game_id):
     """
     consumer = KafkaConsumer(
         f"game_{game_id}",
-        bootstrap_servers=["kafka:19092"],
+        bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
         value_deserializer=lambda x: json.loads(x.decode("utf-8")),
     )
 
-    print(f"Listening for messages on game_{game_id} queue...")
+    logger.info("Listening for messages on game_%s queue...", game_id)
 
     for message in consumer:
         try:
@@ -30,17 +38,17 @@ def kafka_consumer_task(game_id):
                 continue
 
             add_user_to_queue(user_id)  # Redis ZSet에 유저 추가
-            print(f"User {user_id} added to Redis queue for game {game_id}")
+            logger.debug("User %s added to Redis queue for game %s", user_id, game_id)
 
         except Exception as e:
-            print(f"Error processing message: {e}")
+            logger.exception("Error processing message: %s", e)
 
 
 
 def check_reservations():
     consumer = KafkaConsumer(
         'seat_reservation',
-        bootstrap_servers=['kafka:19092'],
+        bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
         group_id='reservation_group',
         auto_offset_reset='latest',
         value_deserializer=lambda x: json.loads(x.decode('utf-8'))
@@ -58,11 +66,11 @@ def check_reservations():
             ticket_id = data["ticket_id"]
             expiration_time = datetime.fromisoformat(data["expiration_time"])
 
-            print(f"처리할 예약: {seat_key}, ticket_id: {ticket_id}, Expiration: {expiration_time}")
+            logger.debug("처리할 예약: %s, ticket_id: %s, Expiration: %s", seat_key, ticket_id, expiration_time)
 
-            if redis_client.exists(seat_key):
+            if get_redis("holds").get(seat_key) == str(data["user_id"]):
                 if datetime.now() > expiration_time:
-                    print(f"예약 {seat_key}이 자동 취소되었습니다.")
+                    logger.info("예약 %s이 자동 취소되었습니다.", seat_key)
                 else:
                     if data["status"] == "confirmed":
                         with transaction.atomic():
@@ -70,20 +78,242 @@ def check_reservations():
                                 user_id=data["user_id"],
                                 event_id=event_id,
                             )
-                            print(ticket_id)
                             seat = Seat.objects.get(id=ticket_id)
-                            print(seat)
                             reservation.tickets.set([seat])
 
-                            redis_client.delete(seat_key)
-                            print(f"Redis에서 {seat_key} 삭제 완료")
-                            print(f"예약 확정: {seat_key} (사용자 {data['user_id']})")
+                            clear_confirmed_holds(event_id, [(ticket_id, data["user_id"])])
+                            logger.info("예약 확정: %s (사용자 %s)", seat_key, data['user_id'])
                     else:
-                        print(f"예약 상태 확인 필요: {data['status']}")
+                        logger.debug("예약 상태 확인 필요: %s", data['status'])
                 
         except KeyError as e:
-            print(f"KeyError: {e} (Kafka 메시지에 필요한 필드가 없습니다)")
+            logger.warning("KeyError: %s (Kafka 메시지에 필요한 필드가 없습니다)", e)
         except json.JSONDecodeError as e:
-            print(f"JSONDecodeError: {e} (잘못된 JSON 형식)")
+            logger.warning("JSONDecodeError: %s (잘못된 JSON 형식)", e)
         except Exception as e:
-            print(f"Unexpected Error: {e}")
+            logger.exception("Unexpected Error: %s", e)
+
+
+CONSUMER_STATUS_KEY = "reservation_consumer:status"  # 워커 이름 -> 상태(JSON) 해시
+
+
+class ReservationConsumer:
+    """
+    check_reservations의 배치 버전
+    최대 max_records개 또는 timeout_ms 동안 모인 메시지를 한 번에 확정하고
+    DB 커밋이 끝난 뒤에만 offset을 커밋
+    DB/Redis 장애로 배치가 실패하면 커밋하지 않고 배치 처음으로 되돌아가 retry_delay 뒤 다시 처리
+    같은 group_id로 여러 프로세스를 띄우면 파티션이 워커별로 나뉘어 할당됨
+    stop()이 호출되면 처리 중인 배치까지 커밋하고 종료
+    """
+
+    def __init__(self, name=None, max_records=None, timeout_ms=None):
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.max_records = max_records or settings.RESERVATION_CONSUMER_BATCH_SIZE
+        self.timeout_ms = timeout_ms or settings.RESERVATION_CONSUMER_BATCH_TIMEOUT_MS
+        self.stopping = False
+        self.processed = 0
+        self.confirmed = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.reported_at = 0
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def run(self):
+        consumer = KafkaConsumer(
+            'seat_reservation',
+            bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+            group_id='reservation_group',
+            auto_offset_reset='latest',
+            enable_auto_commit=False,
+            max_poll_records=self.max_records,
+            value_deserializer=lambda x: json.loads(x.decode('utf-8'))
+        )
+        logger.info("reservation consumer %s 시작", self.name)
+
+        try:
+            while not self.stopping:
+                records = consumer.poll(timeout_ms=self.timeout_ms, max_records=self.max_records)
+                messages = [message.value for batch in records.values() for message in batch]
+                if messages:
+                    try:
+                        confirmed = confirm_reservations(messages)
+                    except (OperationalError, InterfaceError, RedisError):
+                        # 결제가 끝난 확정 메시지를 잃지 않도록 offset을 커밋하지 않고 같은 배치를 다시 읽음
+                        logger.exception("배치 처리 실패, %s초 뒤 다시 처리", settings.RESERVATION_CONSUMER_RETRY_DELAY)
+                        for tp, batch in records.items():
+                            consumer.seek(tp, batch[0].offset)
+                        time.sleep(settings.RESERVATION_CONSUMER_RETRY_DELAY)
+                        continue
+                    consumer.commit()
+                    self.processed += len(messages)
+                    self.confirmed += confirmed
+                    self.batches += 1
+                    self.last_batch_size = len(messages)
+                    logger.info("배치 처리 완료: 메시지 %s건, 예약 확정 %s건", len(messages), confirmed)
+                self.report(consumer)
+        finally:
+            consumer.close(autocommit=False)
+            get_redis("cache").hdel(CONSUMER_STATUS_KEY, self.name)
+            logger.info("reservation consumer %s 종료", self.name)
+
+    def report(self, consumer, force=False):
+        """
+        heartbeat 주기마다 할당된 파티션과 lag(마지막 offset - 현재 위치)을 Redis에 기록
+        """
+        now = time.time()
+        if not force and now - self.reported_at < settings.RESERVATION_CONSUMER_HEARTBEAT:
+            return
+        self.reported_at = now
+
+        partitions = consumer.assignment()
+        end_offsets = consumer.end_offsets(list(partitions)) if partitions else {}
+        lag = {tp.partition: max(0, end_offsets[tp] - consumer.position(tp)) for tp in partitions}
+        with get_redis("cache").pipeline(transaction=False) as pipe:
+            pipe.hset(
+                CONSUMER_STATUS_KEY,
+                self.name,
+                json.dumps({
+                    "pid": os.getpid(),
+                    "heartbeat": now,
+                    "partitions": lag,
+                    "lag": sum(lag.values()),
+                    "processed": self.processed,
+                    "confirmed": self.confirmed,
+                    "batches": self.batches,
+                    "last_batch_size": self.last_batch_size,
+                }),
+            )
+            # 모든 워커가 멈추면 해시 전체가 만료됨
+            pipe.expire(CONSUMER_STATUS_KEY, settings.RESERVATION_CONSUMER_HEARTBEAT * 3)
+            pipe.execute()
+
+
+def get_consumer_status():
+    """
+    살아있는 워커별 상태 {name: {...}} (HGETALL 한 번으로 조회)
+    heartbeat가 주기의 3배 넘게 끊긴 워커(비정상 종료)는 빼고 해시에서도 지움
+    """
+    redis = get_redis("cache")
+    deadline = time.time() - settings.RESERVATION_CONSUMER_HEARTBEAT * 3
+    status = {name: json.loads(value) for name, value in redis.hgetall(CONSUMER_STATUS_KEY).items()}
+    stale = [name for name, value in status.items() if value["heartbeat"] < deadline]
+    if stale:
+        redis.hdel(CONSUMER_STATUS_KEY, *stale)
+    return {name: value for name, value in status.items() if name not in stale}
+
+
+def get_consumer_lag():
+    """
+    살아있는 워커들의 lag 합계 (부하 차단이 주기적으로 읽으므로 HVALS 한 번으로 조회)
+    """
+    deadline = time.time() - settings.RESERVATION_CONSUMER_HEARTBEAT * 3
+    statuses = (json.loads(value) for value in get_redis("cache").hvals(CONSUMER_STATUS_KEY))
+    return sum(status["lag"] for status in statuses if status["heartbeat"] >= deadline)
+
+
+def check_reservations_batch(max_records=None, timeout_ms=None):
+    ReservationConsumer(max_records=max_records, timeout_ms=timeout_ms).run()
+
+
+def confirm_reservations(messages):
+    """
+    Kafka 메시지 묶음을 이벤트별로 모아 예약을 일괄 확정하고 확정 건수를 반환
+    """
+    now = datetime.now()
+    confirms = []
+    for value in messages:
+        try:
+            data = value if isinstance(value, dict) else json.loads(value)
+            if data["status"] != "confirmed":
+                continue
+            if now > datetime.fromisoformat(data["expiration_time"]):
+                logger.info("예약 %s이 자동 취소되었습니다.", data['seat_key'])
+                continue
+            data["ticket_id"] = int(data["ticket_id"])  # 문자열 id도 in_bulk 결과와 비교되도록
+            confirms.append(data)
+        except KeyError as e:
+            logger.warning("KeyError: %s (Kafka 메시지에 필요한 필드가 없습니다)", e)
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            logger.warning("잘못된 메시지: %s", e)
+
+    if not confirms:
+        return 0
+
+    # 메시지의 유저가 아직 잡고 있는 좌석만 확정 (한 번의 파이프라인으로 확인)
+    # 선점이 만료된 뒤 다른 유저가 다시 잡은 좌석은 확정하지 않음
+    holders = pipelined("holds", confirms, lambda pipe, data: pipe.get(data["seat_key"]))
+
+    by_event = defaultdict(dict)
+    for data, holder in zip(confirms, holders):
+        if holder == str(data["user_id"]):
+            by_event[data["event_id"]][data["seat_key"]] = data  # 같은 좌석 중복 메시지는 하나만
+
+    confirmed = 0
+    for event_id, items in by_event.items():
+        confirmed += _confirm_event_reservations(event_id, list(items.values()))
+    return confirmed
+
+
+def _confirm_event_reservations(event_id, items):
+    """
+    이벤트 하나의 예약을 한 트랜잭션(바깥 트랜잭션 안이면 savepoint)으로 확정
+    무결성 오류(없는 유저 등)가 나면 메시지별로 다시 시도하고, 그래도 실패한 메시지만 로그를 남기고 건너뜀
+    DB/Redis 장애는 그대로 올려보내 배치 전체를 다시 처리하게 함
+    이미 같은 유저에게 판매된 좌석(재처리된 메시지)은 선점 정리만 함
+    """
+    seats = Seat.objects.in_bulk([data["ticket_id"] for data in items])
+    items = [data for data in items if data["ticket_id"] in seats]
+    if not items:
+        return 0
+
+    sold = dict(
+        Reservation.tickets.through.objects.filter(seat_id__in=[data["ticket_id"] for data in items])
+        .values_list("seat_id", "reservation__user_id")
+    )
+    pending, done = [], []
+    for data in items:
+        buyer = sold.get(data["ticket_id"])
+        if buyer is None:
+            pending.append(data)
+        elif buyer == int(data["user_id"]):
+            done.append(data)
+        else:
+            logger.warning("이미 다른 유저에게 판매된 좌석, 건너뜀: %s", data)
+    items = pending
+
+    if items:
+        try:
+            _create_reservations(event_id, items)
+        except IntegrityError:
+            logger.warning("이벤트 %s 일괄 확정 실패, 메시지별로 다시 처리", event_id, exc_info=True)
+            confirmed = []
+            for data in items:
+                try:
+                    _create_reservations(event_id, [data])
+                except IntegrityError:
+                    logger.exception("예약 확정 실패, 건너뜀: %s", data)
+                else:
+                    confirmed.append(data)
+            items = confirmed
+
+    if items or done:
+        clear_confirmed_holds(event_id, [(data["ticket_id"], data["user_id"]) for data in items + done])
+
+    return len(items)
+
+
+def _create_reservations(event_id, items):
+    Through = Reservation.tickets.through
+    with transaction.atomic():
+        reservations = Reservation.objects.bulk_create(
+            [Reservation(user_id=data["user_id"], event_id=event_id) for data in items]
+        )
+        Through.objects.bulk_create(
+            [
+                Through(reservation_id=reservation.id, seat_id=data["ticket_id"])
+                for reservation, data in zip(reservations, items)
+            ]
+        )
@@ -0,0 +1,106 @@
+"""
+Idempotency-Key 헤더 처리 (재시도된 POST가 Redis 선점 확인/Kafka 발행을 반복하지 않도록)
+- 첫 요청: SET NX로 "처리 중" 표시를 남기고 뷰를 실행한 뒤 응답을 IDEMPOTENCY_TTL 동안 저장
+- 같은 키의 재요청: 저장된 응답을 그대로 반환 (Idempotent-Replayed: true)
+- 처리 중인 키로 다시 요청하면 409, 같은 키로 다른 요청 본문을 보내면 422
+- 뷰에서 발생한 APIException(ValidationError 등)은 응답으로 바꿔 저장
+- 5xx/429 응답이나 처리되지 않은 예외는 저장하지 않고 표시를 지워 다시 시도할 수 있게 함
+키는 유저/메서드/경로별로 분리되어 다른 유저나 다른 API의 키와 섞이지 않음
+"""
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.metrics import counter
+from core.redis import get_redis
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_REQUESTS = counter(
+    "idempotency_requests_total", "Idempotency-Key 요청 처리 결과 (stored/replayed/in_progress/mismatch/skipped)", ("result",)
+)
+
+# 선점/예약 키와 같은 role에 저장 (캐시 role은 메모리가 부족하면 키가 축출될 수 있음)
+REDIS_ROLE = "holds"
+
+
+def get_idempotency_key(request, key):
+    return f"idempotency:{request.user.pk or 'anonymous'}:{request.method}:{request.path}:{key}"
+
+
+def get_fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, cls=JSONEncoder)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _replay(entry):
+    response = Response(entry["data"], status=entry["status"])
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _error(status_code, detail, result):
+    IDEMPOTENCY_REQUESTS.inc(result)
+    response = Response({"detail": detail}, status=status_code)
+    if status_code == status.HTTP_409_CONFLICT:
+        response["Retry-After"] = "1"
+    return response
+
+
+def idempotent(view_method):
+    """
+    APIView/ViewSet 메서드 데코레이터 (Idempotency-Key 헤더가 없으면 그대로 실행)
+
+        @idempotent
+        def post(self, request): ...
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > 255:
+            raise ValidationError({IDEMPOTENCY_HEADER: "키는 255자 이하여야 합니다."})
+
+        redis = get_redis(REDIS_ROLE)
+        redis_key = get_idempotency_key(request, key)
+        fingerprint = get_fingerprint(request)
+
+        processing = json.dumps({"fingerprint": fingerprint})
+        if not redis.set(redis_key, processing, nx=True, ex=settings.IDEMPOTENCY_LOCK_TTL):
+            entry = json.loads(redis.get(redis_key) or processing)
+            if entry["fingerprint"] != fingerprint:
+                return _error(
+                    status.HTTP_422_UNPROCESSABLE_ENTITY, "같은 Idempotency-Key로 다른 요청을 보낼 수 없습니다.", "mismatch"
+                )
+            if "status" not in entry:
+                return _error(status.HTTP_409_CONFLICT, "같은 Idempotency-Key의 요청을 처리 중입니다.", "in_progress")
+            IDEMPOTENCY_REQUESTS.inc("replayed")
+            return _replay(entry)
+
+        try:
+            try:
+                response = view_method(self, request, *args, **kwargs)
+            except Exception as exc:
+                response = self.handle_exception(exc)
+        except Exception:
+            redis.delete(redis_key)
+            raise
+
+        if response.status_code >= 500 or response.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+            redis.delete(redis_key)
+            IDEMPOTENCY_REQUESTS.inc("skipped")
+            return response
+
+        entry = {"fingerprint": fingerprint, "status": response.status_code, "data": response.data}
+        redis.set(redis_key, json.dumps(entry, cls=JSONEncoder), ex=settings.IDEMPOTENCY_TTL)
+        IDEMPOTENCY_REQUESTS.inc("stored")
+        return response
+
+    return wrapper
@@ -0,0 +1,138 @@
+"""
+구매 경로(예매/결제 확정) 부하 차단 (core.middleware.LoadSheddingMiddleware)
+프로세스(워커)마다 동시 처리 수 한도를 AIMD로 조절하고, 한도를 넘는 요청은 바로 Retry-After와 함께 거절
+- 최근 WINDOW건의 p95가 TARGET_LATENCY 이하이고 한도 가까이 쓰고 있으면 한도 + INCREASE
+- p95가 목표를 넘거나 5xx가 나오면 한도 x DECREASE_FACTOR
+  (연속된 실패로 한도가 한꺼번에 무너지지 않도록 TARGET_LATENCY 동안 한 번만 줄임)
+- 후행 지표(consumer lag, outbox 적체)가 최대치를 넘으면 BACKLOG_CHECK_INTERVAL마다 한도를 줄이고
+  거절 응답을 503으로 (그 외 한도 초과는 429)
+MIN_LIMIT만큼은 항상 받아 후행 지표가 풀리면 다시 한도가 늘어남
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+from core.metrics import counter, gauge, register_collector
+
+logger = logging.getLogger(__name__)
+
+SHED_LIMIT = gauge("load_shedding_limit", "구매 경로 동시 처리 한도 (워커별)")
+SHED_IN_FLIGHT = gauge("load_shedding_in_flight", "구매 경로 처리 중인 요청 수 (워커별)")
+SHED_BACKLOG = gauge("load_shedding_backlog", "마지막으로 확인한 후행 지표", ("signal",))
+SHED_REJECTED = counter("load_shedding_rejected_total", "한도 초과로 거절한 요청 수", ("view", "reason"))
+
+
+def get_backlog():
+    """
+    {지표: 값} - 예약 확정 consumer lag 합계, outbox 전송 대기 수
+    """
+    from core.consumers import get_consumer_lag
+    from core.models import OutboxMessage
+
+    backlog = {"consumer_lag": get_consumer_lag()}
+    if settings.KAFKA_OUTBOX:
+        backlog["outbox"] = OutboxMessage.objects.count()
+    return backlog
+
+
+class AdaptiveLimiter:
+    def __init__(self):
+        self.limit = float(self.config["INITIAL_LIMIT"])
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.latencies = deque(maxlen=self.config["WINDOW"])
+        self.completed = 0
+        self.backlogged = False
+        self.decreased_at = 0
+        self.backlog_checked_at = 0
+        self.checking_backlog = False
+        self._lock = threading.Lock()
+
+    @property
+    def config(self):
+        return settings.LOAD_SHEDDING
+
+    def acquire(self):
+        """
+        처리 가능하면 None, 거절해야 하면 사유("overloaded" | "backlog")
+        """
+        self._check_backlog()
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                return "backlog" if self.backlogged else "overloaded"
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return None
+
+    def release(self, latency, failed=False):
+        with self._lock:
+            self.in_flight -= 1
+            if failed:
+                self._decrease()
+                return
+            self.latencies.append(latency)
+            self.completed += 1
+            if self.completed >= self.config["WINDOW"]:
+                self._update()
+
+    def _update(self):
+        latencies = sorted(self.latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        if p95 > self.config["TARGET_LATENCY"]:
+            self._decrease()
+        elif not self.backlogged and self.peak_in_flight >= int(self.limit) * 0.8:
+            # 한도를 거의 다 쓰고 있을 때만 늘림 (유휴 상태에서 한도만 커지지 않도록)
+            self.limit = min(self.config["MAX_LIMIT"], self.limit + self.config["INCREASE"])
+        self.completed = 0
+        self.peak_in_flight = self.in_flight
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self.decreased_at < self.config["TARGET_LATENCY"]:
+            return
+        self.decreased_at = now
+        self.limit = max(self.config["MIN_LIMIT"], self.limit * self.config["DECREASE_FACTOR"])
+        self.latencies.clear()
+        self.completed = 0
+        self.peak_in_flight = self.in_flight
+
+    def _check_backlog(self):
+        # 요청마다 Redis/DB를 읽지 않도록 한 스레드만 주기적으로 확인
+        now = time.monotonic()
+        with self._lock:
+            if self.checking_backlog or now - self.backlog_checked_at < self.config["BACKLOG_CHECK_INTERVAL"]:
+                return
+            self.checking_backlog = True
+        try:
+            backlog = get_backlog()
+        except Exception:
+            logger.warning("후행 지표 확인 실패", exc_info=True)
+            backlog = {}
+        finally:
+            with self._lock:
+                self.checking_backlog = False
+                self.backlog_checked_at = now
+
+        for signal, value in backlog.items():
+            SHED_BACKLOG.set(signal, value=value)
+        maximums = self.config["MAX_BACKLOG"]
+        backlogged = any(value > maximums[signal] for signal, value in backlog.items() if signal in maximums)
+        with self._lock:
+            self.backlogged = backlogged
+            if backlogged:
+                self._decrease()
+
+    def get_retry_after(self, reason):
+        return self.config["BACKLOG_RETRY_AFTER"] if reason == "backlog" else self.config["RETRY_AFTER"]
+
+
+limiter = AdaptiveLimiter()
+
+
+@register_collector
+def collect_limiter():
+    SHED_LIMIT.set(value=int(limiter.limit))
+    SHED_IN_FLIGHT.set(value=limiter.in_flight)
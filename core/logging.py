@@ -0,0 +1,60 @@
+import json
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    한 줄 JSON 로그 (extra로 넘긴 필드도 함께 기록)
+    """
+    fields = ("pid", "action", "path", "kind")
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in self.fields:
+            if hasattr(record, field):
+                data[field] = getattr(record, field)
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    요청 스레드에서는 큐에 넣기만 하고 실제 출력(I/O)은 백그라운드 스레드에서 처리
+    큐가 가득 차면 요청을 막지 않고 로그를 버림
+    """
+
+    def __init__(self, stream=None, structured=False, fmt=None, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        target = logging.StreamHandler(stream)
+        target.setFormatter(JsonFormatter() if structured else logging.Formatter(fmt))
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, target, respect_handler_level=True)
+        self.listener.start()
+        # fork된 자식 프로세스(consumer 워커 등)에는 listener 스레드가 없으므로 새로 시작
+        os.register_at_fork(after_in_child=self._restart_listener)
+
+    def _restart_listener(self):
+        self.queue = queue.Queue(self.queue.maxsize)
+        self.listener = QueueListener(self.queue, *self.listener.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def close(self):
+        # 종료 시(logging.shutdown) 큐에 남은 로그를 모두 출력한 뒤 listener 정리
+        if self.listener._thread is not None:
+            self.listener.stop()
+        super().close()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
@@ -0,0 +1,70 @@
+import contextlib
+import io
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from core import benchmarks
+
+SUITES = ("queue", "seat_hold", "seat_list", "render", "consumer")
+DEFAULT_SIZES = {
+    "queue": [1000, 10000, 100000],
+    "seat_hold": [1, 2, 4, 8],
+    "seat_list": [1000, 10000],
+    "render": [100, 1000],
+    "consumer": [100, 500],
+}
+FULL_SIZES = {
+    "queue": [1000, 10000, 100000, 1000000],
+    "seat_hold": [1, 2, 4, 8],
+    "seat_list": [1000, 10000, 100000],
+    "render": [100, 1000, 10000],
+    "consumer": [100, 500, 1000],
+}
+
+
+class Command(BaseCommand):
+    help = "대기열/좌석 선점/좌석 목록 직렬화/조회 fast path/consumer 배치 확정 마이크로 벤치마크 (JSON 출력)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("suites", nargs="*", help=f"실행할 벤치마크 {SUITES} (기본: 전체)")
+        parser.add_argument("--full", action="store_true", help="대기열 1M명, 좌석 100k석까지 측정")
+        parser.add_argument("--repeat", type=int, default=1000, help="측정 반복 횟수 (DB 벤치마크는 1/100)")
+        parser.add_argument("--real-redis", action="store_true", help="fakeredis 대신 settings.REDIS_URLS의 Redis 사용 (데이터가 삭제될 수 있음)")
+        parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: 표준 출력)")
+        parser.add_argument("--compare", help="이전 결과 JSON과 p50 비교")
+
+    def handle(self, *args, **options):
+        if not options["real_redis"]:
+            try:
+                benchmarks.use_fake_redis()
+            except ImportError:
+                raise CommandError("fakeredis가 필요합니다: pip install -r requirements/dev.txt")
+
+        suites = options["suites"] or SUITES
+        if unknown := set(suites) - set(SUITES):
+            raise CommandError(f"알 수 없는 벤치마크입니다: {', '.join(sorted(unknown))}")
+        sizes = FULL_SIZES if options["full"] else DEFAULT_SIZES
+
+        # 테스트 DB(sqlite는 메모리)와 로컬 메모리 캐시에서 실행해 실제 데이터에 영향을 주지 않음
+        caches = {alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": alias} for alias in ("default", "sessions")}
+        with override_settings(CACHES=caches), contextlib.redirect_stdout(io.StringIO()):
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(CACHES=caches):
+                result = benchmarks.run(suites, sizes, options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                result["compare"] = benchmarks.compare(json.load(f), result)
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(benchmarks.dumps(result))
+            self.stderr.write(f"결과 저장: {options['output']}")
+        else:
+            self.stdout.write(benchmarks.dumps(result))
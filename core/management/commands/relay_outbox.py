@@ -0,0 +1,28 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.producer import relay_outbox
+
+
+class Command(BaseCommand):
+    help = "Kafka outbox 메시지 전송 (--interval을 주면 종료될 때까지 반복)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0, help="outbox가 비었을 때 다시 확인하는 주기 (초, 0이면 한 번만 실행)")
+        parser.add_argument("--batch-size", type=int, default=None, help="한 번에 전송할 메시지 수")
+
+    def handle(self, *args, **options):
+        stopping = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stopping.append(True))
+
+        while not stopping:
+            sent = relay_outbox(batch_size=options["batch_size"])
+            if sent:
+                self.stdout.write(f"outbox 메시지 {sent}건 전송")
+                continue
+            if not options["interval"]:
+                break
+            time.sleep(options["interval"])
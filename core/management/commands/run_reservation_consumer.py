@@ -0,0 +1,61 @@
+import json
+import logging
+import multiprocessing
+import signal
+import socket
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.consumers import ReservationConsumer, get_consumer_status
+
+
+def _run_worker(index):
+    consumer = ReservationConsumer(name=f"{socket.gethostname()}-{index}")
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # 종료는 부모가 보내는 SIGTERM으로만
+    signal.signal(signal.SIGTERM, consumer.stop)
+    try:
+        consumer.run()
+    finally:
+        logging.shutdown()  # 자식 프로세스는 atexit 없이 종료되므로 남은 로그를 직접 출력
+
+
+class Command(BaseCommand):
+    help = "예약 확정 Kafka consumer를 워커 프로세스 N개로 실행 (같은 consumer group, 파티션 단위로 분배)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=settings.RESERVATION_CONSUMER_WORKERS, help="워커 프로세스 수 (토픽 파티션 수 이하)")
+        parser.add_argument("--status", action="store_true", help="실행 중인 워커의 heartbeat와 lag 출력")
+
+    def handle(self, *args, **options):
+        if options["status"]:
+            self.stdout.write(json.dumps(get_consumer_status(), indent=2))
+            return
+
+        stopping = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stopping.append(True))
+
+        connections.close_all()  # fork 전에 DB 연결을 닫아 워커끼리 공유하지 않도록
+        workers = {index: self._start(index) for index in range(options["workers"])}
+        self.stdout.write(f"reservation consumer 워커 {len(workers)}개 시작")
+
+        while not stopping:
+            time.sleep(1)
+            for index, process in workers.items():
+                if not process.is_alive() and not stopping:
+                    self.stderr.write(f"워커 {index} 종료됨 (exit code {process.exitcode}), 다시 시작")
+                    workers[index] = self._start(index)
+
+        for process in workers.values():
+            process.terminate()  # SIGTERM -> 처리 중인 배치를 커밋한 뒤 종료
+        for process in workers.values():
+            process.join(timeout=settings.RESERVATION_CONSUMER_BATCH_TIMEOUT_MS / 1000 + 30)
+        self.stdout.write("reservation consumer 종료")
+
+    def _start(self, index):
+        process = multiprocessing.Process(target=_run_worker, args=(index,), daemon=False)
+        process.start()
+        return process
@@ -0,0 +1,156 @@
+"""
+Prometheus 텍스트 형식 메트릭 (`/metrics`)
+- 요청 경로에서는 프로세스 메모리의 숫자만 올리고 (lock + dict 연산)
+- Redis에 있는 값(대기열 길이, 선점 수, consumer lag 등)은 수집 시점에 collector가 읽음
+프로세스(워커)마다 따로 집계되므로 워커별로 수집해 합산
+"""
+import threading
+import time
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_lock = threading.Lock()
+_metrics = {}
+_collectors = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+
+    def samples(self):
+        for labels, value in list(self.values.items()):
+            yield self.name, _format_labels(self.labels, labels), value
+
+    def clear(self):
+        with _lock:
+            self.values.clear()
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels, amount=1):
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, *labels, value):
+        with _lock:
+            self.values[labels] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *labels, value):
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            counts = self.values.get(labels)
+            if counts is None:
+                # [버킷별 개수..., +Inf 개수, 합계]
+                counts = self.values[labels] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self):
+        for labels, counts in list(self.values.items()):
+            counts = list(counts)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts[:-1]):
+                cumulative += count
+                yield f"{self.name}_bucket", _format_labels(self.labels + ("le",), labels + (bound,)), cumulative
+            yield f"{self.name}_count", _format_labels(self.labels, labels), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labels, labels), counts[-1]
+
+
+def _register(cls, name, documentation, labels=(), **kwargs):
+    with _lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = cls(name, documentation, labels, **kwargs)
+    return metric
+
+
+def counter(name, documentation, labels=()):
+    return _register(Counter, name, documentation, labels)
+
+
+def gauge(name, documentation, labels=()):
+    return _register(Gauge, name, documentation, labels)
+
+
+def histogram(name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+    return _register(Histogram, name, documentation, labels, buckets=buckets)
+
+
+def register_collector(func):
+    """
+    수집(/metrics 요청) 시점에 호출되어 gauge 값을 채우는 함수 등록 (데코레이터로 사용 가능)
+    """
+    if func not in _collectors:
+        _collectors.append(func)
+    return func
+
+
+class timer:
+    """
+    with timer(histogram, *labels): ... 블록 실행 시간을 기록
+    """
+
+    def __init__(self, metric, *labels):
+        self.metric = metric
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metric.observe(*self.labels, value=time.perf_counter() - self.started)
+
+
+def render():
+    """
+    collector 실행 후 전체 메트릭을 Prometheus 텍스트 형식으로 반환
+    collector 하나가 실패해도 나머지는 출력
+    """
+    for collect in _collectors:
+        try:
+            collect()
+        except Exception:
+            COLLECTOR_ERRORS.inc(collect.__module__ + "." + collect.__name__)
+
+    lines = []
+    for metric in list(_metrics.values()):
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{labels} {value}")
+    return "\n".join(lines) + "\n"
+
+
+COLLECTOR_ERRORS = counter("metrics_collector_errors_total", "collector 실행 실패 횟수", ("collector",))
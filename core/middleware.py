@@ -0,0 +1,118 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+
+from core.load_shedding import SHED_REJECTED, limiter
+from core.metrics import counter, histogram
+
+REQUEST_LATENCY = histogram(
+    "http_request_duration_seconds", "뷰/액션별 요청 처리 시간", ("view", "action", "method", "status")
+)
+REQUEST_EXCEPTIONS = counter("http_request_exceptions_total", "처리되지 않은 예외 수", ("view", "action"))
+
+
+def _get_view_labels(view_func):
+    """
+    DRF viewset은 (클래스 이름, 액션), 그 외 뷰는 (함수/클래스 이름, "") 으로 집계
+    """
+    cls = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    return cls.__name__ if cls else view_func.__name__, getattr(view_func, "actions", None) or {}
+
+
+class MetricsMiddleware:
+    """
+    URL 대신 뷰 단위로 집계해 label 수(cardinality)가 요청 경로에 따라 늘어나지 않도록 함
+    resolve되지 않은 요청(404 등)은 view="unmatched"
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        request._metrics_view = ("unmatched", "")
+        response = self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        request._metrics_view = ("unmatched", "")
+        response = await self.get_response(request)
+        self._observe(request, response, started)
+        return response
+
+    def _observe(self, request, response, started):
+        # 스트리밍(SSE) 응답은 첫 응답 객체를 반환할 때까지의 시간
+        view, action = request._metrics_view
+        REQUEST_LATENCY.observe(
+            view, action, request.method, f"{response.status_code // 100}xx", value=time.perf_counter() - started
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view, actions = _get_view_labels(view_func)
+        request._metrics_view = (view, actions.get(request.method.lower(), ""))
+
+    def process_exception(self, request, exception):
+        REQUEST_EXCEPTIONS.inc(*request._metrics_view)
+
+
+class LoadSheddingMiddleware:
+    """
+    settings.LOAD_SHEDDING["VIEWS"]의 뷰(예매/결제 확정)만 core.load_shedding.limiter로 동시 처리 수를 제한
+    한도를 넘으면 뷰를 실행하지 않고 429(후행 지표 적체 시 503) + Retry-After로 응답
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self._release(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self._release(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        config = settings.LOAD_SHEDDING
+        if not config["ENABLED"]:
+            return None
+        view, actions = _get_view_labels(view_func)
+        action = actions.get(request.method.lower(), "")
+        if (view, action) not in config["VIEWS"] or request.method != "POST":
+            return None
+
+        reason = limiter.acquire()
+        if reason is None:
+            request._load_shedding_started = time.perf_counter()
+            return None
+
+        SHED_REJECTED.inc(view, reason)
+        status = 503 if reason == "backlog" else 429
+        response = JsonResponse({"detail": "요청이 많아 잠시 후 다시 시도해 주세요."}, status=status)
+        response["Retry-After"] = str(limiter.get_retry_after(reason))
+        return response
+
+    def _release(self, request, response):
+        started = getattr(request, "_load_shedding_started", None)
+        if started is not None:
+            limiter.release(time.perf_counter() - started, failed=response.status_code >= 500)
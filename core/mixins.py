@@ -1,43 +1,76 @@
+import hashlib
 import json
 import logging
 import os
+import random
 from collections import OrderedDict
 from typing import Optional
+from urllib.parse import urlencode
 
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.utils.serializer_helpers import ReturnDict
 from rest_framework.viewsets import GenericViewSet, mixins
 
-logger = logging.getLogger("django.server")
+from core.cache import get_generations
+
+logger = logging.getLogger("core.request")
 
 
 class LoggerMixin:
+    """
+    요청/응답 로그
+    settings.REQUEST_LOGGING으로 액션별 샘플링 비율, payload 최대 길이, 헤더 기록 여부를 설정
+    """
     __pid = os.getpid()
 
-    def _get_formatted_string(
-        self: GenericViewSet | Optional["LoggerMixin"], payload: OrderedDict | ReturnDict, _type: str, **kwargs
-    ):
-        return (
-            f"[{_type.upper()}:{self.__pid}]:"
-            + f"[{self.action}]:[{self.request._request.path}] - "
-            + f"[{'HEADER' if _type == 'header' else 'PAYLOAD'}:{payload}]"
+    def _is_log_sampled(self: GenericViewSet | Optional["LoggerMixin"]):
+        # 샘플링 여부는 요청(뷰 인스턴스)마다 한 번만 결정
+        sampled = getattr(self, "_log_sampled", None)
+        if sampled is None:
+            config = settings.REQUEST_LOGGING
+            rate = config["SAMPLE_RATES"].get(self.action, config["DEFAULT_SAMPLE_RATE"])
+            sampled = self._log_sampled = logger.isEnabledFor(logging.INFO) and random.random() < rate
+        return sampled
+
+    @staticmethod
+    def _truncate_payload(payload):
+        if isinstance(payload, (list, tuple)):
+            # 목록 응답은 전체를 문자열로 만들지 않고 건수와 첫 항목만 기록
+            text = f"<{len(payload)} items> {dict(payload[0]) if payload else ''}"
+        elif isinstance(payload, (OrderedDict, ReturnDict)):
+            text = str(dict(payload))
+        else:
+            text = str(payload)
+
+        max_length = settings.REQUEST_LOGGING["MAX_PAYLOAD_LENGTH"]
+        if len(text) > max_length:
+            text = f"{text[:max_length]}...(truncated {len(text) - max_length})"
+        return text
+
+    def _log(self: GenericViewSet | Optional["LoggerMixin"], payload, _type: str):
+        if not self._is_log_sampled():
+            return
+
+        path = self.request._request.path
+        logger.info(
+            "[%s:%s]:[%s]:[%s] - [%s:%s]",
+            _type.upper(), self.__pid, self.action, path,
+            "HEADER" if _type == "header" else "PAYLOAD", self._truncate_payload(payload),
+            extra={"pid": self.__pid, "action": self.action, "path": path, "kind": _type},
         )
 
     def header_logger(self: GenericViewSet | Optional["LoggerMixin"]):
-        logger.info(self._get_formatted_string(self.request.headers, _type="header"))
+        if settings.REQUEST_LOGGING["LOG_HEADERS"]:
+            self._log(self.request.headers, _type="header")
 
     def request_logger(self, payload: OrderedDict = None):
-        logger.info(self._get_formatted_string(payload, _type="request"))
+        self._log(payload, _type="request")
 
     def response_logger(self: GenericViewSet | Optional["LoggerMixin"], payload: ReturnDict = None):
-        if "list" in self.action:
-            payload = json.loads(json.dumps(payload))
-        elif not payload:
-            pass
-        else:
-            payload = dict(payload)
-        logger.info(self._get_formatted_string(payload, _type="response"))
+        self._log(payload, _type="response")
 
 class CreateModelMixin(mixins.CreateModelMixin, LoggerMixin):
     def create(self, request, *args, **kwargs):
@@ -99,6 +132,96 @@ class DestroyModelMixin(mixins.DestroyModelMixin, LoggerMixin):
         instance.delete()
     
 
+class CacheResponseMixin:
+    """
+    액션 단위 응답 캐시 (ListModelMixin/RetrieveModelMixin보다 앞에 둘 것)
+
+    cache_actions = {"list": ("event_id",), "retrieve": ()}  # 액션: 캐시 키에 포함할 query param
+    cache_invalidate_models = ("events.Seat",)  # 저장/삭제 시 캐시를 무효화할 모델 (settings.CACHE_GENERATION_MODELS에도 등록)
+
+    응답에 ETag를 붙이고, If-None-Match가 일치하면 304로 응답
+    캐시하면 안 되는 실시간 값(예: 잔여 좌석 수)은 add_live_data에서 매 요청 덧붙임
+    """
+    cache_actions = {}
+    cache_invalidate_models = ()
+    cache_timeout = 60 * 15
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(super().retrieve, request, *args, **kwargs)
+
+    def get_response_cache_key(self: GenericViewSet | Optional["CacheResponseMixin"]):
+        params = [
+            (param, self.request.query_params.get(param, ""))
+            for param in self.cache_actions[self.action]
+        ]
+        generations = ".".join(str(generation) for generation in get_generations(self.cache_invalidate_models))
+        lookup = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field, "")
+        return f"response:{self.__class__.__name__}:{self.action}:{generations}:{lookup}:{urlencode(params)}"
+
+    def get_cached_response(self: GenericViewSet | Optional["CacheResponseMixin"], handler, request, *args, **kwargs):
+        if self.action not in self.cache_actions:
+            return handler(request, *args, **kwargs)
+
+        cache_key = self.get_response_cache_key()
+        entry = cache.get(cache_key)
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+            content = json.dumps(response.data, sort_keys=True, default=str).encode()
+            entry = {"data": response.data, "etag": f'"{hashlib.md5(content).hexdigest()}"'}
+            cache.set(cache_key, entry, timeout=self.cache_timeout)
+
+        data, live = self.add_live_data(entry["data"])
+        etag = entry["etag"]
+        if live is not None:
+            etag = f'{etag[:-1]}-{hashlib.md5(str(live).encode()).hexdigest()[:8]}"'
+
+        if etag in request.headers.get("If-None-Match", ""):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data, status=status.HTTP_200_OK)
+        response["ETag"] = etag
+        return response
+
+    def add_live_data(self, data):
+        """
+        캐시된 data에 실시간 값을 덧붙여 (새 data, ETag에 반영할 값)을 반환 (캐시된 data는 직접 수정하지 말 것)
+        """
+        return data, None
+
+
+class ValuesSerializerMixin:
+    """
+    조회 액션을 values() 프로젝션 직렬화(core.serializers.ValuesSerializer)로 처리 (MappingViewSetMixin보다 앞에 둘 것)
+
+    values_serializer_action_map = {"list": SeatValuesSerializer}
+
+    settings.FAST_SERIALIZERS가 False이면 serializer_class/serializer_action_map의 serializer 사용
+    """
+    values_serializer_action_map = {}
+
+    def get_values_serializer_class(self: GenericViewSet | Optional["ValuesSerializerMixin"]):
+        # Browsable API가 POST/PUT 폼을 그릴 때는 기존 serializer가 필요
+        if not settings.FAST_SERIALIZERS or self.request.method not in ("GET", "HEAD"):
+            return None
+        return self.values_serializer_action_map.get(self.action)
+
+    def get_serializer_class(self):
+        return self.get_values_serializer_class() or super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        values_serializer_class = self.get_values_serializer_class()
+        if values_serializer_class is not None:
+            queryset = values_serializer_class.project(queryset)
+        return queryset
+
+
 class MappingViewSetMixin:
     serializer_class = None
     permission_classes = None
@@ -5,4 +5,17 @@ class TimeStampModel(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+class OutboxMessage(models.Model):
+    """
+    Kafka로 보낼 메시지를 DB에 먼저 기록하는 outbox
+    요청은 INSERT만 하고, relay(core.producer.relay_outbox)가 모아서 전송 후 삭제
+    """
+    topic = models.CharField(max_length=200)
+    key = models.CharField(max_length=200, blank=True, default="")
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
@@ -1,8 +1,103 @@
 # app/kafka_producer.py
-from kafka import KafkaProducer
+"""
+Kafka 메시지 발행
+- 메시지 key를 event_id로 두어 같은 이벤트의 메시지는 같은 파티션에서 순서대로 처리
+- linger/batch/compression/acks는 settings.KAFKA_PRODUCER로 조절
+- settings.KAFKA_OUTBOX가 켜져 있으면 요청은 outbox 테이블에 INSERT만 하고
+  relay_outbox가 모아서 전송 (브로커 지연/장애가 요청 응답 시간에 영향을 주지 않음)
+"""
 import json
+import logging
+import time
+
+from django.conf import settings
+from django.db import transaction
+from kafka import KafkaProducer
+
+from core.metrics import counter, histogram
+from core.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+KAFKA_MESSAGES = counter("kafka_produced_messages_total", "토픽별 전송 결과 (sent/delivered/failed)", ("topic", "result"))
+KAFKA_LATENCY = histogram("kafka_produce_duration_seconds", "send부터 브로커 응답(ack)까지 걸린 시간", ("topic",))
+
+_producer = None
+
+
+def get_producer():
+    """
+    import 시점이 아닌 첫 발행 때 연결 (브로커가 없어도 모듈 import는 가능)
+    """
+    global _producer
+    if _producer is None:
+        _producer = KafkaProducer(
+            bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
+            key_serializer=lambda k: str(k).encode("utf-8"),
+            value_serializer=lambda v: json.dumps(v).encode("utf-8"),
+            **settings.KAFKA_PRODUCER,
+        )
+    return _producer
+
+
+def _on_delivered(metadata, topic, started):
+    KAFKA_MESSAGES.inc(topic, "delivered")
+    KAFKA_LATENCY.observe(topic, value=time.perf_counter() - started)
+
+
+def _on_failed(exc, topic, started):
+    KAFKA_MESSAGES.inc(topic, "failed")
+    logger.error("Kafka 전송 실패 (%s): %s", topic, exc)
+
+
+def publish(topic, value, key=None):
+    """
+    브로커 응답을 기다리지 않고 전송 후 future 반환 (결과는 KAFKA_MESSAGES/KAFKA_LATENCY에 집계)
+    """
+    started = time.perf_counter()
+    future = get_producer().send(topic, value=value, key=key)
+    KAFKA_MESSAGES.inc(topic, "sent")
+    future.add_callback(_on_delivered, topic, started)
+    future.add_errback(_on_failed, topic, started)
+    return future
+
+
+def enqueue(topic, values, key=None):
+    """
+    메시지 여러 개를 발행 (KAFKA_OUTBOX가 켜져 있으면 outbox에 한 번에 INSERT)
+    """
+    if settings.KAFKA_OUTBOX:
+        OutboxMessage.objects.bulk_create(
+            [OutboxMessage(topic=topic, key="" if key is None else str(key), payload=value) for value in values]
+        )
+        return
+
+    for value in values:
+        publish(topic, value, key=key)
+
+
+def relay_outbox(batch_size=None, timeout=None):
+    """
+    outbox 메시지를 batch_size개씩 전송하고 브로커가 받은 것만 삭제 (at-least-once)
+    전송한 메시지 수를 반환
+    """
+    batch_size = batch_size or settings.KAFKA_OUTBOX_BATCH_SIZE
+    timeout = timeout or settings.KAFKA_OUTBOX_SEND_TIMEOUT
+
+    with transaction.atomic():
+        messages = list(OutboxMessage.objects.select_for_update(skip_locked=True).order_by("id")[:batch_size])
+        if not messages:
+            return 0
+
+        futures = [(message.id, publish(message.topic, message.payload, key=message.key or None)) for message in messages]
+        get_producer().flush(timeout=timeout)
+
+        sent = []
+        for message_id, future in futures:
+            if future.succeeded():
+                sent.append(message_id)
+        OutboxMessage.objects.filter(id__in=sent).delete()
 
-producer = KafkaProducer(
-    bootstrap_servers=["kafka:19092"],
-    value_serializer=lambda v: json.dumps(v).encode("utf-8"),
-)
\ No newline at end of file
+    if len(sent) < len(messages):
+        logger.warning("outbox 전송 실패 %s건 (다음 relay에서 재시도)", len(messages) - len(sent))
+    return len(sent)
@@ -0,0 +1,161 @@
+"""
+용도(role)별 Redis 클라이언트
+settings.REDIS_URLS에서 role마다 다른 DB/인스턴스를 지정할 수 있고,
+같은 URL을 쓰는 role끼리는 하나의 커넥션 풀을 공유
+"""
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from redis.client import Pipeline
+
+from core.metrics import counter, histogram
+
+REDIS_COMMANDS = histogram(
+    "redis_command_duration_seconds", "role/명령별 Redis 왕복 시간 (파이프라인은 PIPELINE)",
+    ("role", "command"), buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1),
+)
+REDIS_PIPELINED = counter("redis_pipelined_commands_total", "파이프라인으로 보낸 명령 수", ("role",))
+REDIS_ERRORS = counter("redis_errors_total", "실패한 Redis 명령 수", ("role", "command"))
+
+_lock = threading.Lock()
+_pools = {}
+_clients = {}
+_async_clients = {}
+
+
+class InstrumentedPipeline(Pipeline):
+    role = None
+
+    def execute(self, raise_on_error=True):
+        size = len(self.command_stack)
+        started = time.perf_counter()
+        try:
+            return super().execute(raise_on_error)
+        except redis.RedisError:
+            REDIS_ERRORS.inc(self.role, "PIPELINE")
+            raise
+        finally:
+            if size:
+                REDIS_COMMANDS.observe(self.role, "PIPELINE", value=time.perf_counter() - started)
+                REDIS_PIPELINED.inc(self.role, amount=size)
+
+
+class InstrumentedRedis(redis.Redis):
+    """
+    명령마다 role/명령 이름으로 횟수와 지연 시간을 기록하는 클라이언트
+    """
+    role = None
+
+    def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        except redis.exceptions.NoScriptError:
+            raise  # register_script가 SCRIPT LOAD 후 재시도하는 정상 흐름
+        except redis.RedisError:
+            REDIS_ERRORS.inc(self.role, args[0])
+            raise
+        finally:
+            REDIS_COMMANDS.observe(self.role, args[0], value=time.perf_counter() - started)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+        pipe.role = self.role
+        return pipe
+
+
+def _get_url(role):
+    try:
+        return settings.REDIS_URLS[role]
+    except KeyError:
+        raise ValueError(f"알 수 없는 Redis role입니다: {role}")
+
+
+def get_redis(role="cache", decode=True):
+    """
+    role에 해당하는 (공유 풀 기반) Redis 클라이언트
+    bitmap 같은 바이너리 값을 읽을 때는 decode=False
+    """
+    client = _clients.get((role, decode))
+    if client is None:
+        with _lock:
+            client = _clients.get((role, decode))
+            if client is None:
+                url = _get_url(role)
+                pool = _pools.get((url, decode))
+                if pool is None:
+                    pool = redis.ConnectionPool.from_url(url, decode_responses=decode, **settings.REDIS_POOL_OPTIONS)
+                    _pools[(url, decode)] = pool
+                client = _clients[(role, decode)] = InstrumentedRedis(connection_pool=pool)
+                client.role = role
+    return client
+
+
+def get_async_redis(role="cache"):
+    """
+    get_redis의 asyncio 버전 (ASGI 뷰 전용)
+    """
+    client = _async_clients.get(role)
+    if client is None:
+        client = _async_clients[role] = aioredis.Redis.from_url(
+            _get_url(role), decode_responses=True, **settings.REDIS_POOL_OPTIONS
+        )
+    return client
+
+
+def register_script(role, source):
+    """
+    Lua 스크립트를 등록하고, 호출 시점의 role 클라이언트로 실행하는 callable을 반환
+    (EVALSHA 실패 시 redis-py가 자동으로 스크립트를 다시 적재)
+    """
+    script = get_redis(role).register_script(source)
+
+    def run(keys=(), args=(), client=None):
+        return script(keys=keys, args=args, client=client or get_redis(role))
+
+    return run
+
+
+def register_async_script(role, source):
+    """
+    register_script의 asyncio 버전
+    """
+    script = get_async_redis(role).register_script(source)
+
+    async def run(keys=(), args=(), client=None):
+        return await script(keys=keys, args=args, client=client or get_async_redis(role))
+
+    return run
+
+
+@contextmanager
+def pipeline(role="cache", transaction=False):
+    """
+    with pipeline("holds") as pipe: ... 형태로 쓰는 파이프라인
+    블록 안에서 execute()를 호출하지 않으면 블록이 끝날 때 한 번에 전송
+    """
+    with get_redis(role).pipeline(transaction=transaction) as pipe:
+        yield pipe
+        if len(pipe):
+            pipe.execute()
+
+
+def pipelined(role, items, command, chunk_size=None):
+    """
+    items마다 command(pipe, item)을 큐에 쌓아 chunk_size 단위로 전송하고
+    items 순서대로 결과 목록을 반환
+    """
+    chunk_size = chunk_size or settings.REDIS_PIPELINE_CHUNK_SIZE
+    results = []
+    items = iter(items)
+    with get_redis(role).pipeline(transaction=False) as pipe:
+        while chunk := list(islice(items, chunk_size)):
+            for item in chunk:
+                command(pipe, item)
+            results.extend(pipe.execute())
+    return results
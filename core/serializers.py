@@ -0,0 +1,71 @@
+"""
+values() 프로젝션 직렬화 (조회 전용 fast path)
+모델 인스턴스/필드 객체를 만들지 않고 queryset.values()의 dict를 그대로 응답 형태로 옮김
+ModelSerializer와 같은 응답을 내도록 datetime/date는 DRF 필드와 같은 형식으로 변환
+
+    class SeatValuesSerializer(ValuesSerializer):
+        fields = {"id": "id", "event": "event_id", "author": {"id": "author_id", "nickname": "author__nickname"}}
+
+뷰에서는 core.mixins.ValuesSerializerMixin으로 액션별로 연결
+"""
+from datetime import date, datetime
+
+from rest_framework import serializers
+
+_datetime_field = serializers.DateTimeField()
+
+
+def to_primitive(value):
+    if isinstance(value, datetime):
+        return _datetime_field.to_representation(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class ValuesSerializer:
+    fields = {}  # {"응답 키": "values() 경로" 또는 중첩 dict}
+    extra_paths = ()  # 응답에는 없지만 to_representation에서 필요한 values() 경로
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    @classmethod
+    def get_value_paths(cls, fields=None):
+        paths = []
+        for path in (cls.fields if fields is None else fields).values():
+            paths += cls.get_value_paths(path) if isinstance(path, dict) else [path]
+        return paths
+
+    @classmethod
+    def project(cls, queryset):
+        """
+        응답에 필요한 컬럼만 SELECT하는 queryset (prefetch는 dict에 적용할 수 없으므로 제거)
+        """
+        paths = cls.get_value_paths() + list(cls.extra_paths)
+        return queryset.prefetch_related(None).values(*dict.fromkeys(paths))
+
+    def prepare(self, rows):
+        """
+        rows 전체에 대해 한 번만 필요한 추가 조회 (예: M2M id 목록)
+        """
+
+    def build(self, row, fields):
+        return {
+            key: self.build(row, path) if isinstance(path, dict) else to_primitive(row[path])
+            for key, path in fields.items()
+        }
+
+    def to_representation(self, row):
+        return self.build(row, self.fields)
+
+    @property
+    def data(self):
+        if not hasattr(self, "_data"):
+            rows = list(self.instance) if self.many else [self.instance]
+            self.prepare(rows)
+            data = [self.to_representation(row) for row in rows]
+            self._data = data if self.many else data[0]
+        return self._data
@@ -0,0 +1,52 @@
+import weakref
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from core.cache import bump_generation, get_model_label
+
+
+class PendingGenerations(set):
+    """
+    트랜잭션 안에서 저장/삭제된 모델 라벨 (커밋될 때 모델마다 한 번만 세대를 올림)
+    """
+
+    def __call__(self):
+        bump_generation(*self)
+
+
+def _get_pending_generations(connection):
+    # 커넥션에는 약한 참조만 두고 on_commit 목록이 집합을 잡고 있도록 함
+    # (롤백되면 콜백과 함께 집합도 사라지므로 다음 트랜잭션은 새 집합과 콜백으로 시작)
+    ref = getattr(connection, "pending_cache_generations", None)
+    pending = ref() if ref else None
+    if pending is None:
+        pending = PendingGenerations()
+        transaction.on_commit(pending, using=connection.alias)
+        connection.pending_cache_generations = weakref.ref(pending)
+    return pending
+
+
+def bump_model_cache_generation(sender, using, **kwargs):
+    """
+    응답 캐시에 쓰이는 모델 저장/삭제 시 해당 모델의 응답 캐시 세대를 올림
+    트랜잭션 안에서는 커밋 후 모델마다 한 번만 올림 (롤백되면 올리지 않음)
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        bump_generation(sender)
+        return
+    _get_pending_generations(connection).add(get_model_label(sender))
+
+
+def connect_cache_generation_signals():
+    """
+    settings.CACHE_GENERATION_MODELS에만 연결
+    (수신자가 없는 모델은 QuerySet.delete()가 행마다 signal을 보내지 않고 한 번에 삭제됨)
+    """
+    for label in settings.CACHE_GENERATION_MODELS:
+        model = apps.get_model(label)
+        post_save.connect(bump_model_cache_generation, sender=model, dispatch_uid="core.cache_generation")
+        post_delete.connect(bump_model_cache_generation, sender=model, dispatch_uid="core.cache_generation")
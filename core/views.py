@@ -0,0 +1,30 @@
+import hmac
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse
+
+from core.metrics import render
+
+
+def has_metrics_access(request):
+    """
+    staff 유저이거나 Authorization: Bearer <METRICS_TOKEN> 헤더를 보낸 수집기만 허용
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_staff:
+        return True
+    token = settings.METRICS_TOKEN
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    return bool(token) and scheme.lower() == "bearer" and hmac.compare_digest(credentials.encode(), token.encode())
+
+
+def metrics_view(request):
+    """
+    Prometheus 수집 엔드포인트 (큐 이름, 워커 호스트/PID, 이벤트별 값이 노출되므로 인증 필요)
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    if not has_metrics_access(request):
+        raise PermissionDenied
+    return HttpResponse(render(), content_type="text/plain; version=0.0.4; charset=utf-8")
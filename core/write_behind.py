@@ -0,0 +1,129 @@
+"""
+Write-behind 버퍼
+요청에서는 Redis에 O(1)로 기록만 하고, 주기적인 작업이 버퍼를 통째로 교체(RENAME)한 뒤
+chunk 단위로 DB에 일괄 반영
+- 교체 이후 들어온 기록은 새 버퍼에 쌓이므로 flush 중에도 유실되지 않음
+- chunk가 반영될 때마다 처리 중 키에서 해당 항목을 지워, 실패 시 남은 항목만 다음 flush에서 재시도
+- max_retries번 실패한 처리 중 키는 :dead:로 옮기고 로그를 남김
+
+kind
+- "set":     add(member)              -> flush([member, ...])
+- "latest":  add(member, value)       -> flush([(member, 마지막 value), ...])
+- "counter": add(member, amount=1)    -> flush([(member, 누적 amount), ...])
+"""
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.db.models import F
+
+from core.redis import get_redis, register_script
+
+logger = logging.getLogger(__name__)
+
+# KEYS = [버퍼, 처리 중 키, 처리 중 키 목록]
+SWAP_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('RENAME', KEYS[1], KEYS[2])
+redis.call('SADD', KEYS[3], KEYS[2])
+return 1
+"""
+
+
+class WriteBehindBuffer:
+    def __init__(self, name, flush, kind="set", role="cache", chunk_size=None, max_retries=None):
+        if kind not in ("set", "latest", "counter"):
+            raise ValueError(f"알 수 없는 write-behind 종류입니다: {kind}")
+        self.name = name
+        self.kind = kind
+        self.role = role
+        self.apply = flush
+        self.chunk_size = chunk_size or settings.WRITE_BEHIND_CHUNK_SIZE
+        self.max_retries = max_retries or settings.WRITE_BEHIND_MAX_RETRIES
+        self.key = f"write_behind:{name}"
+        self.pending_key = f"{self.key}:pending"
+        self.retries_key = f"{self.key}:retries"
+        self.swap = register_script(role, SWAP_SCRIPT)
+
+    def add(self, member, value=None, amount=1):
+        redis = get_redis(self.role)
+        if self.kind == "set":
+            redis.sadd(self.key, member)
+        elif self.kind == "latest":
+            redis.hset(self.key, member, value)
+        else:
+            redis.hincrby(self.key, member, amount)
+
+    def flush(self):
+        """
+        이전에 실패한 처리 중 키를 먼저 재시도한 뒤 현재 버퍼를 교체해 반영
+        반영한 항목 수를 반환
+        """
+        redis = get_redis(self.role)
+        # 오래된 처리 중 키부터 반영되도록 시각을 앞에 둠 ("latest"에서 이전 값이 덮어쓰지 않도록)
+        processing = f"{self.key}:flushing:{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        self.swap(keys=[self.key, processing, self.pending_key])
+
+        flushed = 0
+        for key in sorted(redis.smembers(self.pending_key)):
+            try:
+                flushed += self._flush_key(redis, key)
+            except Exception:
+                self._on_failure(redis, key)
+            else:
+                with redis.pipeline(transaction=False) as pipe:
+                    pipe.delete(key)
+                    pipe.srem(self.pending_key, key)
+                    pipe.hdel(self.retries_key, key)
+                    pipe.execute()
+        return flushed
+
+    def _flush_key(self, redis, key):
+        if self.kind == "set":
+            items = sorted(redis.smembers(key))
+        else:
+            items = sorted(redis.hgetall(key).items())
+            if self.kind == "counter":
+                items = [(member, int(amount)) for member, amount in items]
+
+        for start in range(0, len(items), self.chunk_size):
+            chunk = items[start:start + self.chunk_size]
+            self.apply(chunk)
+            if self.kind == "set":
+                redis.srem(key, *chunk)
+            else:
+                redis.hdel(key, *[member for member, _ in chunk])
+        return len(items)
+
+    def _on_failure(self, redis, key):
+        retries = redis.hincrby(self.retries_key, key, 1)
+        if retries < self.max_retries:
+            logger.warning("write-behind %s 반영 실패 (%s/%s), 다음 flush에서 재시도", key, retries, self.max_retries, exc_info=True)
+            return
+
+        dead = key.replace(":flushing:", ":dead:")
+        with redis.pipeline(transaction=True) as pipe:
+            pipe.rename(key, dead)
+            pipe.srem(self.pending_key, key)
+            pipe.hdel(self.retries_key, key)
+            pipe.execute()
+        logger.error("write-behind %s 반영 %s회 실패, %s로 이동", key, retries, dead, exc_info=True)
+
+
+def increment_flush(model, field):
+    """
+    counter 버퍼용 flush 함수 생성: 같은 증가량끼리 묶어 UPDATE ... SET field = field + n
+        views = WriteBehindBuffer("event_views", increment_flush(Event, "views"), kind="counter")
+    """
+
+    def flush(items):
+        by_amount = {}
+        for member, amount in items:
+            by_amount.setdefault(amount, []).append(member)
+        for amount, ids in by_amount.items():
+            model.objects.filter(id__in=ids).update(**{field: F(field) + amount})
+
+    return flush
@@ -0,0 +1,159 @@
+"""
+대기열 입장 스케줄러 (token bucket)
+대기열마다 초당 rate명씩 토큰이 쌓이고, 틱마다 쌓인 토큰 수만큼 앞에서부터 입장시킴
+입장한 유저는 ADMISSION_TTL 동안 입장 목록(<queue>:admitted)에 남아 좌석 선택 시 확인
+매진된 이벤트의 대기열은 입장을 멈추고, 선점이 만료되어 잔여 좌석이 생기면 다시 입장시킴
+rate는 Redis(<queue>:rate)에서 매 틱 읽으므로 오픈 중에도 바로 조절 가능
+"""
+import logging
+import time
+
+from django.conf import settings
+
+from core.redis import get_async_redis, get_redis, register_script
+from events.inventory import get_remaining_seats
+from events.queue_manager import ACTIVE_QUEUES_KEY, get_queue_event_id, get_queue_key, publish_serving
+
+logger = logging.getLogger(__name__)
+
+# KEYS = [대기열, bucket 해시, 입장 목록, rate, 활성 대기열 목록]
+# ARGV = [현재 시각, 기본 rate, burst, 입장 유지 시간]
+# 반환 = [입장한 user_id 목록, 마지막 입장 순번, 남은 대기 인원]
+ADMIT_SCRIPT = register_script(
+    "queue",
+    """
+    local now = tonumber(ARGV[1])
+    local rate = tonumber(redis.call('GET', KEYS[4]) or ARGV[2])
+    local burst = tonumber(ARGV[3])
+    if burst <= 0 then
+        burst = math.max(rate, 1)
+    end
+
+    local bucket = redis.call('HMGET', KEYS[2], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or 0
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+    local admitted = {}
+    local serving = false
+    local count = math.floor(tokens)
+    if count > 0 then
+        local popped = redis.call('ZPOPMIN', KEYS[1], count)
+        for i = 1, #popped, 2 do
+            redis.call('ZADD', KEYS[3], now + tonumber(ARGV[4]), popped[i])
+            table.insert(admitted, popped[i])
+            serving = popped[i + 1]
+        end
+        tokens = tokens - #admitted
+    end
+
+    redis.call('HSET', KEYS[2], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[2], 3600)
+    redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now)
+    redis.call('EXPIRE', KEYS[3], tonumber(ARGV[4]))
+
+    local remaining = redis.call('ZCARD', KEYS[1])
+    if remaining == 0 then
+        redis.call('SREM', KEYS[5], KEYS[1])
+    end
+    return {admitted, serving, remaining}
+    """
+)
+
+
+def get_admitted_key(queue_key):
+    return f"{queue_key}:admitted"
+
+
+def get_rate_key(queue_key):
+    return f"{queue_key}:rate"
+
+
+def admit_queue(queue_key, now=None):
+    """
+    대기열 하나에 대해 한 틱 입장 처리 후 입장한 user_id 목록을 반환
+    """
+    now = now or time.time()
+    admitted, serving, remaining = ADMIT_SCRIPT(
+        keys=[queue_key, f"{queue_key}:bucket", get_admitted_key(queue_key), get_rate_key(queue_key), ACTIVE_QUEUES_KEY],
+        args=[now, settings.ADMISSION_RATE, settings.ADMISSION_BURST, settings.ADMISSION_TTL],
+    )
+    if admitted:
+        publish_serving(queue_key, serving, remaining)
+    return admitted
+
+
+def admit_all(now=None):
+    """
+    대기 인원이 있는 모든 대기열을 한 틱 처리하고 {대기열 키: 입장 user_id 목록} 반환
+    """
+    now = now or time.time()
+    results = {}
+    queue_keys = get_redis("queue").smembers(ACTIVE_QUEUES_KEY)
+    event_queues = [queue_key for queue_key in queue_keys if get_queue_event_id(queue_key) is not None]
+    remaining = dict(zip(event_queues, get_remaining_seats([get_queue_event_id(queue_key) for queue_key in event_queues])))
+    for queue_key in queue_keys:
+        if remaining.get(queue_key, 1) <= 0:
+            continue  # 매진
+
+        admitted = admit_queue(queue_key, now)
+        if admitted:
+            results[queue_key] = admitted
+    return results
+
+
+def run_admission(tick=None, stop=lambda: False):
+    """
+    Celery Beat 없이 tick초 간격으로 입장 처리를 반복 (stop()이 True가 되면 종료)
+    Redis 장애 등으로 한 틱이 실패해도 로그만 남기고 다음 틱을 계속 처리
+    """
+    tick = tick or settings.ADMISSION_TICK
+    while not stop():
+        started = time.monotonic()
+        try:
+            admit_all()
+        except Exception:
+            logger.exception("입장 처리 실패")
+        time.sleep(max(0, tick - (time.monotonic() - started)))
+
+
+def set_admission_rate(rate, event_id=None):
+    """
+    초당 입장 인원 변경 (rate가 None이면 기본값 settings.ADMISSION_RATE로 복귀)
+    """
+    key = get_rate_key(get_queue_key(event_id))
+    if rate is None:
+        get_redis("queue").delete(key)
+    else:
+        get_redis("queue").set(key, rate)
+
+
+def get_admission_rate(event_id=None):
+    rate = get_redis("queue").get(get_rate_key(get_queue_key(event_id)))
+    return float(rate) if rate is not None else settings.ADMISSION_RATE
+
+
+def is_admitted(user_id, event_id=None):
+    """
+    이벤트 대기열 또는 공용 대기열을 통해 입장한 유저인지 확인
+    """
+    queue_keys = {get_queue_key(event_id), get_queue_key()}
+    with get_redis("queue").pipeline(transaction=False) as pipe:
+        for queue_key in queue_keys:
+            pipe.zscore(get_admitted_key(queue_key), user_id)
+        expires = pipe.execute()
+    now = time.time()
+    return any(expire is not None and expire > now for expire in expires)
+
+
+async def ais_admitted(user_id, event_id=None):
+    """
+    is_admitted의 async 버전
+    """
+    queue_keys = {get_queue_key(event_id), get_queue_key()}
+    async with get_async_redis("queue").pipeline(transaction=False) as pipe:
+        for queue_key in queue_keys:
+            pipe.zscore(get_admitted_key(queue_key), user_id)
+        expires = await pipe.execute()
+    now = time.time()
+    return any(expire is not None and expire > now for expire in expires)
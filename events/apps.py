@@ -6,4 +6,5 @@ class EventsConfig(AppConfig):
     name = 'events'
 
     def ready(self):
-        import events.signals
\ No newline at end of file
+        import events.metrics
+        import events.signals
@@ -0,0 +1,108 @@
+"""
+이벤트별 좌석 잔여 현황 bitmap
+좌석을 id 순으로 정렬한 순번(ordinal)마다 1bit (1 = 예매 가능, 0 = 선점/판매됨)
+좌석 배치(layout)는 좌석이 추가될 때만 바뀌므로 version을 붙여 클라이언트가 영구 캐싱
+"""
+import base64
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from core.redis import get_redis, pipelined
+from events.models import Reservation, Seat
+
+
+def get_availability_key(event_id):
+    return f"seat_availability:{event_id}"
+
+
+def get_layout_key(event_id):
+    """
+    seat_id -> ordinal 해시 (선점/해제 스크립트에서 bit 위치를 찾을 때 사용)
+    """
+    return f"seat_layout:{event_id}"
+
+
+def get_layout_version(event_id):
+    stats = Seat.objects.filter(event_id=event_id).aggregate(count=Count("id"), last_id=Max("id"))
+    return f"{stats['count']}-{stats['last_id'] or 0}"
+
+
+def get_seat_layout(event_id):
+    """
+    (version, [[seat_id, position], ...]) 를 ordinal 순서로 반환
+    """
+    version = get_layout_version(event_id)
+    cache_key = f"event_{event_id}_seat_layout_{version}"
+    seats = cache.get(cache_key)
+    if seats is None:
+        seats = [list(seat) for seat in Seat.objects.filter(event_id=event_id).order_by("id").values_list("id", "position")]
+        cache.set(cache_key, seats, timeout=settings.SEAT_AVAILABILITY_TTL)
+    return version, seats
+
+
+def rebuild_availability(event_id):
+    """
+    DB의 판매 정보와 Redis의 선점 키로 bitmap을 다시 만들어 저장
+    """
+    from events.seat_holds import get_seat_key
+
+    version, seats = get_seat_layout(event_id)
+    seat_ids = [seat_id for seat_id, _ in seats]
+    sold = set(
+        Reservation.tickets.through.objects.filter(seat__event_id=event_id).values_list("seat_id", flat=True)
+    )
+    sold.update(Seat.objects.filter(event_id=event_id, is_reserved=True).values_list("id", flat=True))
+    held = pipelined("holds", seat_ids, lambda pipe, seat_id: pipe.exists(get_seat_key(event_id, seat_id)))
+
+    bitmap = bytearray((len(seat_ids) + 7) // 8)
+    for ordinal, (seat_id, is_held) in enumerate(zip(seat_ids, held)):
+        if seat_id not in sold and not is_held:
+            bitmap[ordinal // 8] |= 0x80 >> (ordinal % 8)
+
+    ttl = settings.SEAT_AVAILABILITY_TTL
+    layout_key = get_layout_key(event_id)
+    with get_redis("holds", decode=False).pipeline(transaction=True) as pipe:
+        pipe.set(get_availability_key(event_id), bytes(bitmap), ex=ttl)
+        pipe.set(f"{get_availability_key(event_id)}:version", version, ex=ttl)
+        pipe.delete(layout_key)
+        if seat_ids:
+            pipe.hset(layout_key, mapping={seat_id: ordinal for ordinal, seat_id in enumerate(seat_ids)})
+            pipe.expire(layout_key, ttl)
+        pipe.execute()
+
+    return version, bytes(bitmap)
+
+
+def get_availability(event_id):
+    """
+    (version, bitmap) 반환, 저장된 bitmap이 없으면 새로 생성
+    """
+    key = get_availability_key(event_id)
+    with get_redis("holds", decode=False).pipeline(transaction=False) as pipe:
+        pipe.get(key)
+        pipe.get(f"{key}:version")
+        bitmap, version = pipe.execute()
+
+    if bitmap is None or version is None:
+        return rebuild_availability(event_id)
+    return version.decode(), bitmap
+
+
+def get_packed_availability(event_id):
+    version, bitmap = get_availability(event_id)
+    return {
+        "event": int(event_id),
+        "version": version,
+        "available": int.from_bytes(bitmap, "big").bit_count(),
+        "bitmap": base64.b64encode(bitmap).decode(),
+    }
+
+
+def invalidate_availability(event_id):
+    """
+    좌석이 추가되어 배치가 바뀌면 bitmap과 ordinal 해시를 버림 (다음 조회 시 재생성)
+    """
+    key = get_availability_key(event_id)
+    get_redis("holds").delete(key, f"{key}:version", get_layout_key(event_id))
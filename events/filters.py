@@ -0,0 +1,59 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class EventFilterBackend(BaseFilterBackend):
+    """
+    이벤트 목록 필터 (Event.Meta.indexes의 복합 인덱스와 짝을 이룸)
+    ?category=1
+    ?date_from=2024-12-01&date_to=2024-12-31  (event_date 범위)
+    ?on_sale=2024-11-20  (해당 날짜에 판매 중, true면 오늘)
+    """
+
+    @staticmethod
+    def _get_date(params, name):
+        value = params.get(name)
+        if value in (None, ""):
+            return None
+        if name == "on_sale" and value.lower() == "true":
+            return timezone.localdate()
+        try:
+            date = parse_date(value)
+        except ValueError:  # 형식은 맞지만 없는 날짜 (예: 2024-02-30)
+            date = None
+        if date is None:
+            raise ValidationError({name: "YYYY-MM-DD 형식이어야 합니다."})
+        return date
+
+    @staticmethod
+    def _get_int(params, name):
+        value = params.get(name)
+        if value in (None, ""):
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({name: "정수여야 합니다."})
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        category = self._get_int(params, "category")
+        if category is not None:
+            queryset = queryset.filter(category_id=category)
+
+        date_from = self._get_date(params, "date_from")
+        if date_from:
+            queryset = queryset.filter(event_date__gte=date_from)
+
+        date_to = self._get_date(params, "date_to")
+        if date_to:
+            queryset = queryset.filter(event_date__lte=date_to)
+
+        on_sale = self._get_date(params, "on_sale")
+        if on_sale:
+            queryset = queryset.filter(period_start__lte=on_sale, period_end__gte=on_sale)
+
+        return queryset
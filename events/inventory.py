@@ -0,0 +1,119 @@
+"""
+이벤트별 잔여 좌석 수 카운터 (holds Redis의 event_inventory:{event_id})
+잔여 = 판매되지 않은 좌석 수 - 선점 중인 좌석 수(선점 만료 ZSet 크기)
+- 선점/해제/만료 해제 스크립트(events.seat_holds)가 같은 원자적 연산 안에서 감소/증가
+- 카운터가 없으면 조회 시 DB로 계산해 만들고, reconcile_inventory가 주기적으로 DB 기준으로 보정
+  (예매 취소, 확정과 만료가 겹친 경우 등 스크립트 밖에서 생긴 오차)
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count
+
+from core.redis import get_async_redis, get_redis, register_script
+from events.models import Seat
+
+INVENTORY_EVENTS_KEY = "event_inventory:events"  # 카운터가 있는 이벤트 id 목록 (보정 작업이 순회)
+
+# KEYS = [카운터, 선점 만료 ZSet, 카운터가 있는 이벤트 목록]
+# ARGV = [판매되지 않은 좌석 수, TTL(초), event_id, "init" | "reconcile"]
+# init: 카운터가 없을 때만 생성하고 현재 값을 반환
+# reconcile: 카운터가 있으면 TTL은 그대로 두고 값만 바꾼 뒤 [이전 값, 새 값] 반환 (없으면 목록에서 제거)
+SET_INVENTORY_SCRIPT = register_script(
+    "holds",
+    """
+    local remaining = math.max(0, tonumber(ARGV[1]) - redis.call('ZCARD', KEYS[2]))
+    if ARGV[4] == 'init' then
+        if redis.call('SET', KEYS[1], remaining, 'NX', 'EX', ARGV[2]) then
+            redis.call('SADD', KEYS[3], ARGV[3])
+        end
+        return tonumber(redis.call('GET', KEYS[1]))
+    end
+    local previous = redis.call('GET', KEYS[1])
+    if not previous then
+        redis.call('SREM', KEYS[3], ARGV[3])
+        return false
+    end
+    redis.call('SET', KEYS[1], remaining, 'KEEPTTL')
+    return {tonumber(previous), remaining}
+    """
+)
+
+
+def get_inventory_key(event_id):
+    return f"event_inventory:{event_id}"
+
+
+def get_unsold_counts(event_ids):
+    """
+    {str(event_id): 판매되지 않은 좌석 수} (좌석이 없는 이벤트는 빠짐)
+    """
+    rows = (
+        Seat.objects.filter(event_id__in=event_ids, is_reserved=False, reservations__isnull=True)
+        .values("event_id").annotate(unsold=Count("id"))
+    )
+    return {str(row["event_id"]): row["unsold"] for row in rows}
+
+
+def _set_inventory(event_ids, mode):
+    from events.seat_holds import get_hold_expiry_key
+
+    unsold = get_unsold_counts(event_ids)
+    with get_redis("holds").pipeline(transaction=False) as pipe:
+        for event_id in event_ids:
+            SET_INVENTORY_SCRIPT(
+                keys=[get_inventory_key(event_id), get_hold_expiry_key(event_id), INVENTORY_EVENTS_KEY],
+                args=[unsold.get(str(event_id), 0), settings.EVENT_INVENTORY_TTL, event_id, mode],
+                client=pipe,
+            )
+        return pipe.execute()
+
+
+def get_remaining_seats(event_ids):
+    """
+    event_ids 순서대로 잔여 좌석 수 목록 (카운터가 없는 이벤트는 DB 한 번의 쿼리로 계산해 생성)
+    숫자가 아닌 event_id는 0
+    """
+    if not event_ids:
+        return []
+    values = get_redis("holds").mget([get_inventory_key(event_id) for event_id in event_ids])
+    missing = [event_id for event_id, value in zip(event_ids, values) if value is None and str(event_id).isdigit()]
+    created = dict(zip(missing, _set_inventory(missing, "init"))) if missing else {}
+    return [
+        max(0, int(value)) if value is not None else created.get(event_id, 0)
+        for event_id, value in zip(event_ids, values)
+    ]
+
+
+def is_sold_out(event_id):
+    return get_remaining_seats([event_id])[0] <= 0
+
+
+async def ais_sold_out(event_id):
+    """
+    is_sold_out의 asyncio 버전 (카운터가 없을 때만 DB 조회를 스레드에서 실행)
+    """
+    value = await get_async_redis("holds").get(get_inventory_key(event_id))
+    if value is None:
+        return await sync_to_async(is_sold_out)(event_id)
+    return int(value) <= 0
+
+
+def reconcile_inventory():
+    """
+    카운터가 있는 모든 이벤트를 DB 기준으로 다시 계산하고 {event_id: (이전 값, 새 값)} 중 달라진 것만 반환
+    """
+    event_ids = sorted(get_redis("holds").smembers(INVENTORY_EVENTS_KEY))
+    drifted = {}
+    for start in range(0, len(event_ids), settings.REDIS_PIPELINE_CHUNK_SIZE):
+        chunk = event_ids[start:start + settings.REDIS_PIPELINE_CHUNK_SIZE]
+        for event_id, result in zip(chunk, _set_inventory(chunk, "reconcile")):
+            if result and result[0] != result[1]:
+                drifted[event_id] = tuple(result)
+    return drifted
+
+
+def invalidate_inventory(event_id):
+    """
+    좌석이 추가되면 카운터를 버림 (다음 조회 시 재생성)
+    """
+    get_redis("holds").delete(get_inventory_key(event_id))
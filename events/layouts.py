@@ -0,0 +1,91 @@
+"""
+좌석 배치 생성기
+구역(section)마다 열(rows)과 번호(seats) 범위를 받아 좌석 position 문자열을 하나씩 생성
+    {"name": "A", "rows": "A-Z", "seats": "1-200"}  ->  "A-A-1", "A-A-2", ... "A-Z-200"
+범위는 "1-200", "A-Z", "1,3,5", "A-C,F" 형식을 지원
+"""
+import string
+
+from django.conf import settings
+
+
+def split_range(value):
+    """
+    "A-C,F" -> [("A", "C"), ("F", "F")] (범위를 펼치지 않고 형식만 검증)
+    """
+    parts = []
+    for part in str(value).split(","):
+        part = part.strip()
+        if not part:
+            continue
+
+        start, sep, end = part.partition("-")
+        if not sep:
+            parts.append((part, part))
+        elif start.isdigit() and end.isdigit():
+            if int(start) > int(end):
+                raise ValueError(f"잘못된 범위입니다: {part}")
+            parts.append((start, end))
+        elif len(start) == 1 and len(end) == 1 and start in string.ascii_letters and end in string.ascii_letters:
+            if ord(start) > ord(end):
+                raise ValueError(f"잘못된 범위입니다: {part}")
+            parts.append((start, end))
+        else:
+            raise ValueError(f"잘못된 범위입니다: {part}")
+    return parts
+
+
+def count_range(value):
+    """
+    범위의 라벨 수를 펼치지 않고 계산 ("1-200" -> 200, "A-C,F" -> 4)
+    """
+    count = 0
+    for start, end in split_range(value):
+        if start == end:
+            count += 1
+        elif start.isdigit():
+            count += int(end) - int(start) + 1
+        else:
+            count += ord(end) - ord(start) + 1
+    return count
+
+
+def parse_range(value):
+    """
+    "A-C,F" -> ["A", "B", "C", "F"] / "1-3" -> ["1", "2", "3"]
+    SEAT_LAYOUT_MAX_SEATS보다 큰 범위는 펼치기 전에 거절
+    """
+    if count_range(value) > settings.SEAT_LAYOUT_MAX_SEATS:
+        raise ValueError(f"범위가 너무 큽니다 (최대 {settings.SEAT_LAYOUT_MAX_SEATS}개): {value}")
+
+    labels = []
+    for start, end in split_range(value):
+        if start == end:
+            labels.append(start)
+        elif start.isdigit():
+            labels.extend(str(number) for number in range(int(start), int(end) + 1))
+        else:
+            labels.extend(chr(code) for code in range(ord(start), ord(end) + 1))
+    return labels
+
+
+def get_position(section, row, seat):
+    return "-".join(str(label) for label in (section, row, seat) if label)
+
+
+def count_section(section):
+    """
+    구역의 좌석 수 (범위를 펼치지 않으므로 아무리 큰 범위도 바로 계산되고, 최대치 검사는 호출하는 쪽에서)
+    """
+    return count_range(section["rows"]) * count_range(section["seats"])
+
+
+def expand_layout(sections):
+    """
+    구역 목록을 좌석 position 문자열로 펼치는 generator (전체 목록을 메모리에 올리지 않음)
+    """
+    for section in sections:
+        seats = parse_range(section["seats"])
+        for row in parse_range(section["rows"]):
+            for seat in seats:
+                yield get_position(section.get("name"), row, seat)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from events.admission import get_admission_rate, set_admission_rate
+
+
+class Command(BaseCommand):
+    help = "대기열 초당 입장 인원 조회/변경 (실행 중인 스케줄러에 바로 반영)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("rate", nargs="?", help="초당 입장 인원 (default 입력 시 기본값으로 복귀)")
+        parser.add_argument("--event", type=int, default=None, help="이벤트 id (생략 시 공용 대기열)")
+
+    def handle(self, *args, **options):
+        rate = options["rate"]
+        if rate is not None:
+            set_admission_rate(None if rate == "default" else float(rate), options["event"])
+        self.stdout.write(f"초당 입장 인원: {get_admission_rate(options['event'])}")
@@ -0,0 +1,22 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from events.admission import run_admission
+
+
+class Command(BaseCommand):
+    help = "대기열 입장 스케줄러 실행 (token bucket, 1초 미만 주기)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tick", type=float, default=settings.ADMISSION_TICK, help="입장 처리 주기 (초)")
+
+    def handle(self, *args, **options):
+        stopping = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stopping.append(True))
+
+        self.stdout.write(f"입장 스케줄러 시작 (tick={options['tick']}s, 기본 rate={settings.ADMISSION_RATE}명/초)")
+        run_admission(tick=options["tick"], stop=lambda: bool(stopping))
+        self.stdout.write("입장 스케줄러 종료")
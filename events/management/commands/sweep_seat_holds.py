@@ -0,0 +1,27 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.seat_holds import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = "만료된 좌석 선점 해제 (--interval을 주면 종료될 때까지 반복)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=0, help="반복 주기 (초, 0이면 한 번만 실행)")
+        parser.add_argument("--batch-size", type=int, default=None, help="한 번에 해제할 좌석 수")
+
+    def handle(self, *args, **options):
+        stopping = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stopping.append(True))
+
+        while not stopping:
+            started = time.monotonic()
+            for event_id, ticket_ids in release_expired_holds(batch_size=options["batch_size"]).items():
+                self.stdout.write(f"이벤트 {event_id}: 만료된 선점 {len(ticket_ids)}석 해제")
+            if not options["interval"]:
+                break
+            time.sleep(max(0, options["interval"] - (time.monotonic() - started)))
@@ -0,0 +1,83 @@
+"""
+Redis/DB에 있는 상태를 /metrics 수집 시점에 읽는 collector
+요청 처리 경로에는 비용이 없고, 수집 한 번에 대기열/이벤트 수만큼의 파이프라인 왕복만 발생
+"""
+import time
+
+from django.conf import settings
+
+from core.consumers import get_consumer_status
+from core.metrics import gauge, register_collector
+from core.models import OutboxMessage
+from core.redis import get_redis, pipelined
+from events.admission import get_admitted_key, get_rate_key
+from events.inventory import INVENTORY_EVENTS_KEY, get_inventory_key
+from events.queue_manager import ACTIVE_QUEUES_KEY
+from events.seat_holds import HOLD_EVENTS_KEY, get_hold_expiry_key
+
+QUEUE_LENGTH = gauge("waiting_room_queue_length", "대기열 대기 인원", ("queue",))
+QUEUE_ADMITTED = gauge("waiting_room_admitted", "입장 후 좌석 선택 중인 인원", ("queue",))
+ADMISSION_RATE = gauge("waiting_room_admission_rate", "초당 입장 인원 설정값", ("queue",))
+SEAT_HOLDS = gauge("seat_holds", "이벤트별 선점 중인 좌석 수", ("event",))
+REMAINING_SEATS = gauge("event_remaining_seats", "이벤트별 잔여 좌석 카운터", ("event",))
+CONSUMER_LAG = gauge("reservation_consumer_lag", "워커별 미처리 메시지 수", ("worker",))
+CONSUMER_PROCESSED = gauge("reservation_consumer_processed", "워커 시작 후 처리한 메시지 수", ("worker",))
+CONSUMER_LAST_BATCH = gauge("reservation_consumer_last_batch_size", "워커의 마지막 배치 크기", ("worker",))
+CONSUMER_HEARTBEAT_AGE = gauge("reservation_consumer_heartbeat_age_seconds", "마지막 heartbeat 이후 경과 시간", ("worker",))
+OUTBOX_BACKLOG = gauge("kafka_outbox_backlog", "전송 대기 중인 outbox 메시지 수")
+
+
+@register_collector
+def collect_queues():
+    queue_keys = sorted(get_redis("queue").smembers(ACTIVE_QUEUES_KEY))
+
+    def command(pipe, queue_key):
+        pipe.zcard(queue_key)
+        pipe.zcard(get_admitted_key(queue_key))
+        pipe.get(get_rate_key(queue_key))
+
+    values = pipelined("queue", queue_keys, command)
+    for metric in (QUEUE_LENGTH, QUEUE_ADMITTED, ADMISSION_RATE):
+        metric.clear()
+    for index, queue_key in enumerate(queue_keys):
+        length, admitted, rate = values[index * 3:index * 3 + 3]
+        QUEUE_LENGTH.set(queue_key, value=length)
+        QUEUE_ADMITTED.set(queue_key, value=admitted)
+        ADMISSION_RATE.set(queue_key, value=float(rate) if rate is not None else settings.ADMISSION_RATE)
+
+
+@register_collector
+def collect_seat_holds():
+    event_ids = sorted(get_redis("holds").smembers(HOLD_EVENTS_KEY))
+    counts = pipelined("holds", event_ids, lambda pipe, event_id: pipe.zcard(get_hold_expiry_key(event_id)))
+    SEAT_HOLDS.clear()
+    for event_id, count in zip(event_ids, counts):
+        SEAT_HOLDS.set(event_id, value=count)
+
+
+@register_collector
+def collect_inventory():
+    event_ids = sorted(get_redis("holds").smembers(INVENTORY_EVENTS_KEY))
+    counts = get_redis("holds").mget([get_inventory_key(event_id) for event_id in event_ids]) if event_ids else []
+    REMAINING_SEATS.clear()
+    for event_id, count in zip(event_ids, counts):
+        if count is not None:
+            REMAINING_SEATS.set(event_id, value=int(count))
+
+
+@register_collector
+def collect_consumers():
+    now = time.time()
+    for metric in (CONSUMER_LAG, CONSUMER_PROCESSED, CONSUMER_LAST_BATCH, CONSUMER_HEARTBEAT_AGE):
+        metric.clear()
+    for worker, status in get_consumer_status().items():
+        CONSUMER_LAG.set(worker, value=status["lag"])
+        CONSUMER_PROCESSED.set(worker, value=status["processed"])
+        CONSUMER_LAST_BATCH.set(worker, value=status.get("last_batch_size", 0))
+        CONSUMER_HEARTBEAT_AGE.set(worker, value=round(now - status["heartbeat"], 3))
+
+
+@register_collector
+def collect_outbox():
+    if settings.KAFKA_OUTBOX:
+        OUTBOX_BACKLOG.set(value=OutboxMessage.objects.count())
@@ -22,6 +22,14 @@ class Event(TimeStampModel):
     event_date = models.DateField()
     content = models.TextField()
 
+    class Meta:
+        indexes = [
+            # 목록 페이지네이션 (event_date, id) 및 필터 조합용
+            models.Index(fields=["event_date", "id"], name="event_date_id_idx"),
+            models.Index(fields=["category", "event_date", "id"], name="event_category_date_idx"),
+            models.Index(fields=["period_start", "period_end"], name="event_sale_period_idx"),
+        ]
+
     def clean(self):
         if self.period_start > self.period_end:
             raise ValidationError("시작 날짜는 종료 날짜보다 이전이어야 합니다.")
@@ -52,6 +60,9 @@ class Reservation(models.Model):
 
     @property
     def ticket_count(self):
+        # 목록 조회 시에는 annotate(ticket_total=Count("tickets"))로 미리 계산된 값을 사용
+        if hasattr(self, "ticket_total"):
+            return self.ticket_total
         if self.pk:
             return self.tickets.count()
         return 0
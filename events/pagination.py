@@ -0,0 +1,21 @@
+from rest_framework.pagination import CursorPagination
+
+
+class EventCursorPagination(CursorPagination):
+    """
+    (event_date, id) 기준 keyset 페이지네이션 - 목록이 커져도 OFFSET 없이 일정한 속도
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("event_date", "id")
+
+
+class ReservationCursorPagination(CursorPagination):
+    """
+    내 예매 내역 (최신순)
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
@@ -1,28 +1,120 @@
 # app/queue_manager.py
-import redis
 import json
-import time
 
-redis_client = redis.StrictRedis(host="redis", port=6379, db=0, decode_responses=True)
+from core.redis import get_redis, get_async_redis, register_script, register_async_script
+
 QUEUE_NAME = "ticketing_queue"
+ACTIVE_QUEUES_KEY = f"{QUEUE_NAME}:active"  # 대기 인원이 있는 대기열 키 목록 (입장 스케줄러가 순회)
+
+# 유저당 하나의 member(user_id)만 유지하고, 입장 순번(seq)을 score로 사용
+# 이미 대기 중인 유저가 다시 들어오면 기존 순번을 그대로 반환 (중복 등록 방지)
+ENTER_QUEUE_LUA = """
+local score = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if score then
+    return score
+end
+local seq = redis.call('INCR', KEYS[2])
+redis.call('ZADD', KEYS[1], seq, ARGV[1])
+redis.call('SADD', KEYS[3], KEYS[1])
+return seq
+"""
+ENTER_QUEUE_SCRIPT = register_script("queue", ENTER_QUEUE_LUA)
+ASYNC_ENTER_QUEUE_SCRIPT = register_async_script("queue", ENTER_QUEUE_LUA)
+
+
+def get_queue_key(event_id=None):
+    """
+    이벤트별 대기열 키 (event_id가 없으면 기존 공용 대기열)
+    """
+    if event_id is None:
+        return QUEUE_NAME
+    return f"{QUEUE_NAME}:{event_id}"
+
 
-def add_user_to_queue(user_id):
+def get_queue_event_id(queue_key):
     """
-    유저를 Redis ZSet에 추가
+    get_queue_key의 역 (공용 대기열이면 None)
     """
-    timestamp = int(time.time())  # 현재 타임스탬프를 기반으로 정렬
-    user_data = json.dumps({"user_id": user_id, "timestamp": timestamp})
-    redis_client.zadd(QUEUE_NAME, {user_data: timestamp})
+    _, _, event_id = queue_key.partition(f"{QUEUE_NAME}:")
+    return event_id or None
+
 
-def remove_user_from_queue(user_id):
+def get_serving_channel(event_id=None):
+    """
+    대기열 앞이 진행될 때 "현재 입장 순번"을 발행하는 pub/sub 채널
+    """
+    return f"{get_queue_key(event_id)}:serving"
+
+
+def publish_serving(queue_key, serving, total_user):
+    """
+    SSE 대기 화면이 각자 폴링하지 않도록 마지막으로 입장한 순번을 발행
+    """
+    get_redis("queue").publish(
+        f"{queue_key}:serving",
+        json.dumps({"serving": int(serving), "total_user": total_user}),
+    )
+
+
+def add_user_to_queue(user_id, event_id=None):
+    """
+    유저를 Redis ZSet에 추가하고 입장 순번을 반환
+    """
+    queue_key = get_queue_key(event_id)
+    return int(ENTER_QUEUE_SCRIPT(keys=[queue_key, f"{queue_key}:seq", ACTIVE_QUEUES_KEY], args=[user_id]))
+
+
+def get_queue_position(user_id, event_id=None):
+    """
+    유저의 대기 순번(1부터 시작)과 전체 대기 인원을 O(log N)으로 조회
+    대기열에 없으면 position은 None
+    """
+    queue_key = get_queue_key(event_id)
+    with get_redis("queue").pipeline(transaction=False) as pipe:
+        pipe.zrank(queue_key, user_id)
+        pipe.zcard(queue_key)
+        rank, total_user = pipe.execute()
+
+    position = rank + 1 if rank is not None else None
+    return position, total_user
+
+
+def remove_user_from_queue(user_id, event_id=None):
     """
     유저가 새로고침하거나 페이지를 떠나면 Redis에서 제거
     """
-    users = redis_client.zrange(QUEUE_NAME, 0, -1)
+    return bool(get_redis("queue").zrem(get_queue_key(event_id), user_id))
+
+
+def pop_users_from_queue(count, event_id=None):
+    """
+    대기열 앞에서부터 최대 count명을 꺼내 user_id 목록으로 반환
+    """
+    queue_key = get_queue_key(event_id)
+    redis_client = get_redis("queue")
+    users = redis_client.zpopmin(queue_key, count)
+    if users:
+        publish_serving(queue_key, users[-1][1], redis_client.zcard(queue_key))
+    return [user_id for user_id, _ in users]
+
+
+async def aadd_user_to_queue(user_id, event_id=None):
+    """
+    add_user_to_queue의 async 버전
+    """
+    queue_key = get_queue_key(event_id)
+    return int(await ASYNC_ENTER_QUEUE_SCRIPT(keys=[queue_key, f"{queue_key}:seq", ACTIVE_QUEUES_KEY], args=[user_id]))
+
+
+async def aget_queue_position(user_id, event_id=None):
+    """
+    get_queue_position의 async 버전
+    """
+    queue_key = get_queue_key(event_id)
+    async with get_async_redis("queue").pipeline(transaction=False) as pipe:
+        pipe.zrank(queue_key, user_id)
+        pipe.zcard(queue_key)
+        rank, total_user = await pipe.execute()
 
-    for user_data in users:
-        user_info = json.loads(user_data)
-        if user_info.get("user_id") == user_id:
-            redis_client.zrem(QUEUE_NAME, user_data)
-            print(f"User {user_id} removed from queue")
-            break
+    position = rank + 1 if rank is not None else None
+    return position, total_user
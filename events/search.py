@@ -0,0 +1,102 @@
+"""
+이벤트 전문 검색 (title + content)
+- SQLite: FTS5 가상 테이블 events_event_fts (rowid = event id), 트리거로 INSERT/UPDATE/DELETE마다 갱신
+- PostgreSQL: events_event.search_vector (tsvector 생성 컬럼) + GIN 인덱스, 행 저장 시 DB가 갱신
+둘 다 DB 안에서 유지되므로 save()/delete()뿐 아니라 bulk_create/update()도 반영됨
+그 외 DB는 icontains로 대체 (인덱스 없음)
+인덱스는 0005_event_search 마이그레이션에서 생성
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "events_event_fts"
+
+SQLITE_SCHEMA = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, content, tokenize='unicode61')",
+    f"""CREATE TRIGGER IF NOT EXISTS events_event_fts_insert AFTER INSERT ON events_event BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS events_event_fts_update AFTER UPDATE OF title, content ON events_event BEGIN
+        UPDATE {FTS_TABLE} SET title = new.title, content = new.content WHERE rowid = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS events_event_fts_delete AFTER DELETE ON events_event BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"INSERT INTO {FTS_TABLE}(rowid, title, content) SELECT id, title, content FROM events_event",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS events_event_fts_insert",
+    "DROP TRIGGER IF EXISTS events_event_fts_update",
+    "DROP TRIGGER IF EXISTS events_event_fts_delete",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# 한국어 사전이 없으므로 형태소 분석 없이 공백 단위로 나누는 'simple' 사용
+POSTGRES_SCHEMA = [
+    """ALTER TABLE events_event ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(content, ''))) STORED""",
+    "CREATE INDEX IF NOT EXISTS events_event_search_idx ON events_event USING GIN (search_vector)",
+]
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS events_event_search_idx",
+    "ALTER TABLE events_event DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_SCHEMA)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_SCHEMA)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _run(schema_editor, SQLITE_DROP)
+    elif vendor == "postgresql":
+        _run(schema_editor, POSTGRES_DROP)
+
+
+def get_terms(query):
+    """
+    검색어를 단어 목록으로 (따옴표/연산자 등은 버려 검색 문법 주입을 막음)
+    """
+    return re.findall(r"\w+", query)[:10]
+
+
+def search_events(queryset, query):
+    """
+    모든 단어를 (접두어로) 포함하는 이벤트만 남긴 queryset
+    """
+    terms = get_terms(query)
+    if not terms:
+        return queryset.none()
+
+    if connection.vendor == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+        )
+
+    if connection.vendor == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        return queryset.annotate(
+            search_match=RawSQL(
+                "events_event.search_vector @@ to_tsquery('simple', %s)", (tsquery,), output_field=BooleanField()
+            )
+        ).filter(search_match=True)
+
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(content__icontains=term)
+    return queryset.filter(condition)
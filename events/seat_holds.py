@@ -0,0 +1,278 @@
+import time
+
+from django.conf import settings
+
+from core.redis import get_redis, register_script
+from events.availability import get_availability_key, get_layout_key
+from events.inventory import get_inventory_key
+
+HOLD_EVENTS_KEY = "seat_holds:events"  # 선점 중인 좌석이 있는 이벤트 id 목록 (만료 처리기가 순회)
+
+# KEYS = 좌석 선점 키들 + [잔여 좌석 bitmap, seat_id -> ordinal 해시, 선점 만료 ZSet, 선점 이벤트 목록, 잔여 좌석 카운터, 판매된 좌석 Set]
+# ARGV = [user_id, ttl(ms), 현재 시각(ms), event_id, 좌석 id들...]
+# 요청한 좌석을 모두 확인한 뒤 하나라도 이미 판매되었거나 다른 유저가 선점했다면 아무것도 잡지 않고
+# 충돌한 좌석 키 목록을 반환, 모두 비어 있으면 TTL과 함께 한 번에 선점 (all-or-nothing)
+# 잔여 좌석 카운터는 만료 ZSet에 없던 좌석(새 선점)만큼만 감소
+# (재선점, 또는 TTL로 키가 사라졌지만 아직 만료 해제되지 않은 좌석은 이미 빠져 있음)
+HOLD_SEATS_SCRIPT = register_script(
+    "holds",
+    """
+    local n = #KEYS - 6
+    local bitmap, layout, expiry, events, inventory, sold = KEYS[n + 1], KEYS[n + 2], KEYS[n + 3], KEYS[n + 4], KEYS[n + 5], KEYS[n + 6]
+    local conflicts = {}
+    for i = 1, n do
+        local holder = redis.call('GET', KEYS[i])
+        if (holder and holder ~= ARGV[1]) or redis.call('SISMEMBER', sold, ARGV[i + 4]) == 1 then
+            table.insert(conflicts, KEYS[i])
+        end
+    end
+    if #conflicts > 0 then
+        return conflicts
+    end
+    local expire_at = tonumber(ARGV[3]) + tonumber(ARGV[2])
+    local has_bitmap = redis.call('EXISTS', bitmap) == 1
+    local held = 0
+    for i = 1, n do
+        redis.call('SET', KEYS[i], ARGV[1], 'PX', ARGV[2])
+        held = held + redis.call('ZADD', expiry, expire_at, ARGV[i + 4])
+        if has_bitmap then
+            local ordinal = redis.call('HGET', layout, ARGV[i + 4])
+            if ordinal then
+                redis.call('SETBIT', bitmap, ordinal, 0)
+            end
+        end
+    end
+    redis.call('SADD', events, ARGV[4])
+    if held > 0 and redis.call('EXISTS', inventory) == 1 then
+        redis.call('DECRBY', inventory, held)
+    end
+    return conflicts
+    """
+)
+
+# 본인이 잡고 있는 좌석만 해제
+RELEASE_SEATS_SCRIPT = register_script(
+    "holds",
+    """
+    local n = #KEYS - 6
+    local bitmap, layout, expiry, inventory = KEYS[n + 1], KEYS[n + 2], KEYS[n + 3], KEYS[n + 5]
+    local has_bitmap = redis.call('EXISTS', bitmap) == 1
+    local released = 0
+    local restored = 0
+    for i = 1, n do
+        if redis.call('GET', KEYS[i]) == ARGV[1] then
+            released = released + redis.call('DEL', KEYS[i])
+            restored = restored + redis.call('ZREM', expiry, ARGV[i + 1])
+            if has_bitmap then
+                local ordinal = redis.call('HGET', layout, ARGV[i + 1])
+                if ordinal then
+                    redis.call('SETBIT', bitmap, ordinal, 1)
+                end
+            end
+        end
+    end
+    if restored > 0 and redis.call('EXISTS', inventory) == 1 then
+        redis.call('INCRBY', inventory, restored)
+    end
+    return released
+    """
+)
+
+# 만료된 선점을 최대 limit개 해제하고 해제한 좌석 id 목록을 반환
+# KEYS = [선점 만료 ZSet, 잔여 좌석 bitmap, seat_id -> ordinal 해시, 선점 이벤트 목록, 잔여 좌석 카운터]
+# ARGV = [현재 시각(ms), limit, event_id]
+RELEASE_EXPIRED_SCRIPT = register_script(
+    "holds",
+    """
+    local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+    local has_bitmap = redis.call('EXISTS', KEYS[2]) == 1
+    for i, ticket_id in ipairs(expired) do
+        redis.call('ZREM', KEYS[1], ticket_id)
+        redis.call('DEL', 'seat_reservation: ' .. ARGV[3] .. '-' .. ticket_id)
+        if has_bitmap then
+            local ordinal = redis.call('HGET', KEYS[3], ticket_id)
+            if ordinal then
+                redis.call('SETBIT', KEYS[2], ordinal, 1)
+            end
+        end
+    end
+    if #expired > 0 and redis.call('EXISTS', KEYS[5]) == 1 then
+        redis.call('INCRBY', KEYS[5], #expired)
+    end
+    if redis.call('ZCARD', KEYS[1]) == 0 then
+        redis.call('SREM', KEYS[4], ARGV[3])
+    end
+    return expired
+    """
+)
+
+
+# 본인이 잡고 있는 좌석의 선점 만료 시각을 다시 정함 (키 TTL과 만료 ZSet 점수를 함께 변경)
+# 결제 확정 요청이 들어오면 consumer가 처리할 때까지 길게, 확정 메시지 전송에 실패하면 다시 짧게
+# 만료 ZSet에 남아 있으므로 끝내 확정되지 않은 선점도 만료 처리기가 해제함
+# 잔여 좌석 카운터는 선점 때 이미 감소했으므로 그대로 둠
+# KEYS = [좌석 선점 키, 선점 만료 ZSet], ARGV = [user_id, ticket_id, ttl(ms), 현재 시각(ms)]
+EXTEND_HOLD_SCRIPT = register_script(
+    "holds",
+    """
+    if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+        return 0
+    end
+    redis.call('PEXPIRE', KEYS[1], ARGV[3])
+    redis.call('ZADD', KEYS[2], tonumber(ARGV[4]) + tonumber(ARGV[3]), ARGV[2])
+    return 1
+    """
+)
+
+# 확정된 좌석을 판매된 좌석 Set에 넣어 다시 선점되지 않도록 하고,
+# 아직 같은 유저가 잡고 있는 선점만 정리 (그 사이 다른 유저가 다시 잡은 키는 남김)
+# KEYS = 좌석 선점 키들 + [선점 만료 ZSet, 판매된 좌석 Set], ARGV = [user_id, ticket_id, user_id, ticket_id, ...]
+CLEAR_CONFIRMED_SCRIPT = register_script(
+    "holds",
+    """
+    local n = #KEYS - 2
+    local cleared = 0
+    for i = 1, n do
+        redis.call('SADD', KEYS[n + 2], ARGV[i * 2])
+        if redis.call('GET', KEYS[i]) == ARGV[i * 2 - 1] then
+            cleared = cleared + redis.call('DEL', KEYS[i])
+            redis.call('ZREM', KEYS[n + 1], ARGV[i * 2])
+        end
+    end
+    return cleared
+    """
+)
+
+# 예매가 취소된 좌석을 판매된 좌석 Set에서 빼고 bitmap과 잔여 좌석 카운터에 되돌림
+# KEYS = [판매된 좌석 Set, 잔여 좌석 bitmap, seat_id -> ordinal 해시, 잔여 좌석 카운터], ARGV = 좌석 id들
+RELEASE_SOLD_SCRIPT = register_script(
+    "holds",
+    """
+    local has_bitmap = redis.call('EXISTS', KEYS[2]) == 1
+    local released = 0
+    for i, ticket_id in ipairs(ARGV) do
+        if redis.call('SREM', KEYS[1], ticket_id) == 1 then
+            released = released + 1
+            if has_bitmap then
+                local ordinal = redis.call('HGET', KEYS[3], ticket_id)
+                if ordinal then
+                    redis.call('SETBIT', KEYS[2], ordinal, 1)
+                end
+            end
+        end
+    end
+    if released > 0 and redis.call('EXISTS', KEYS[4]) == 1 then
+        redis.call('INCRBY', KEYS[4], released)
+    end
+    return released
+    """
+)
+
+
+def get_seat_key(event_id, ticket_id):
+    return f"seat_reservation: {event_id}-{ticket_id}"
+
+
+def get_hold_expiry_key(event_id):
+    """
+    ticket_id -> 선점 만료 시각(ms) ZSet
+    """
+    return f"seat_holds:{event_id}"
+
+
+def get_sold_key(event_id):
+    """
+    예약이 확정된(판매된) 좌석 id Set (선점 키가 지워진 뒤에도 다시 선점되지 않도록)
+    """
+    return f"seat_sold:{event_id}"
+
+
+def _get_keys(event_id, ticket_ids):
+    keys = [get_seat_key(event_id, ticket_id) for ticket_id in ticket_ids]
+    return keys + [
+        get_availability_key(event_id),
+        get_layout_key(event_id),
+        get_hold_expiry_key(event_id),
+        HOLD_EVENTS_KEY,
+        get_inventory_key(event_id),
+        get_sold_key(event_id),
+    ]
+
+
+def hold_seats(event_id, ticket_ids, user_id, ttl=None):
+    """
+    좌석 여러 개를 한 번의 왕복으로 원자적으로 선점
+    충돌한(이미 판매되었거나 다른 유저가 선점한) ticket_id 목록을 반환 (비어 있으면 전부 선점 성공)
+    """
+    ttl = ttl or settings.SEAT_HOLD_TTL
+    keys = _get_keys(event_id, ticket_ids)
+    conflicts = set(
+        HOLD_SEATS_SCRIPT(keys=keys, args=[user_id, int(ttl * 1000), int(time.time() * 1000), event_id, *ticket_ids])
+    )
+    return [ticket_id for ticket_id, key in zip(ticket_ids, keys) if key in conflicts]
+
+
+def release_seats(event_id, ticket_ids, user_id):
+    """
+    유저가 선점한 좌석을 해제하고 해제된 좌석 수를 반환
+    """
+    return RELEASE_SEATS_SCRIPT(keys=_get_keys(event_id, ticket_ids), args=[user_id, *ticket_ids])
+
+
+def extend_hold(event_id, ticket_id, user_id, ttl):
+    """
+    user_id가 잡고 있는 선점을 지금부터 ttl초 뒤에 만료되도록 변경
+    user_id가 잡고 있는 좌석이 아니면 False
+    """
+    return bool(
+        EXTEND_HOLD_SCRIPT(
+            keys=[get_seat_key(event_id, ticket_id), get_hold_expiry_key(event_id)],
+            args=[user_id, ticket_id, int(ttl * 1000), int(time.time() * 1000)],
+        )
+    )
+
+
+def clear_confirmed_holds(event_id, holds, pipe=None):
+    """
+    예약이 확정된 좌석을 판매된 좌석 Set에 넣고 선점 정보를 정리 (판매된 좌석이므로 bitmap은 그대로 둠)
+    holds = [(ticket_id, user_id), ...], 선점 키는 해당 유저가 잡고 있는 것만 정리
+    pipe를 넘기면 해당 파이프라인에 명령만 추가
+    """
+    keys = [get_seat_key(event_id, ticket_id) for ticket_id, _ in holds]
+    args = [value for ticket_id, user_id in holds for value in (user_id, ticket_id)]
+    return CLEAR_CONFIRMED_SCRIPT(
+        keys=keys + [get_hold_expiry_key(event_id), get_sold_key(event_id)], args=args, client=pipe
+    )
+
+
+def release_sold_seats(event_id, ticket_ids):
+    """
+    예매가 취소된 좌석을 다시 선점할 수 있도록 되돌리고 되돌린 좌석 수를 반환
+    """
+    keys = [get_sold_key(event_id), get_availability_key(event_id), get_layout_key(event_id), get_inventory_key(event_id)]
+    return RELEASE_SOLD_SCRIPT(keys=keys, args=ticket_ids)
+
+
+def release_expired_holds(now=None, batch_size=None):
+    """
+    모든 이벤트의 만료된 선점을 batch_size개씩 해제하고 {event_id: 해제된 좌석 id 목록} 반환
+    """
+    now_ms = int((now or time.time()) * 1000)
+    batch_size = batch_size or settings.SEAT_HOLD_SWEEP_BATCH_SIZE
+    released = {}
+    for event_id in get_redis("holds").smembers(HOLD_EVENTS_KEY):
+        keys = [
+            get_hold_expiry_key(event_id),
+            get_availability_key(event_id),
+            get_layout_key(event_id),
+            HOLD_EVENTS_KEY,
+            get_inventory_key(event_id),
+        ]
+        while True:
+            expired = RELEASE_EXPIRED_SCRIPT(keys=keys, args=[now_ms, batch_size, event_id])
+            released.setdefault(event_id, []).extend(expired)
+            if len(expired) < batch_size:
+                break
+        if not released[event_id]:
+            del released[event_id]
+    return released
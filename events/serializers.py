@@ -1,15 +1,25 @@
+from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Prefetch
+from itertools import islice
 from datetime import datetime, timedelta
 
 from rest_framework import serializers
-from rest_framework.exceptions import ValidationError
-import redis
+from rest_framework.exceptions import PermissionDenied, ValidationError
 
-from accounts.serializers import AuthorSerializer
+from accounts.images import get_variant_url
+from accounts.serializers import AuthorSerializer, ProfileImageField
 from events.models import Category, Event, Seat, Reservation
-from core.producer import producer
+from events.admission import is_admitted
+from events.availability import invalidate_availability
+from events.inventory import invalidate_inventory, is_sold_out
+from events.layouts import count_section, expand_layout
+from events.seat_holds import get_seat_key, hold_seats, release_seats
+from core.cache import bump_generation
+from core.serializers import ValuesSerializer
+from core.producer import enqueue
 
-redis_client = redis.StrictRedis(host="redis", port=6379, db=0, decode_responses=True)
 
 class CategorySerializers(serializers.ModelSerializer):
     class Meta:
@@ -39,7 +49,7 @@ class EventSerializers(serializers.ModelSerializer):
 
 
 class EventListSerializers(serializers.ModelSerializer):
-    profile_image = serializers.ImageField(source='author.image', read_only=True)
+    profile_image = ProfileImageField(size=settings.EVENT_LIST_AUTHOR_IMAGE_SIZE, source='author')
     nickname = serializers.CharField(source='author.nickname', read_only=True)
 
     category_name = serializers.SerializerMethodField(read_only=True)
@@ -52,6 +62,67 @@ class EventListSerializers(serializers.ModelSerializer):
         return obj.category.name if obj.category else None
 
 
+class EventValuesSerializer(ValuesSerializer):
+    """
+    EventSerializers와 같은 응답 (상세 조회 fast path)
+    """
+    fields = {
+        "id": "id",
+        "author": {
+            "id": "author_id",
+            "email": "author__user__email",
+            "phone_number": "author__user__phone_number",
+            "image": "author__image",
+            "nickname": "author__nickname",
+            "role": "author__role",
+        },
+        "category_name": "category__name",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+        "title": "title",
+        "period_start": "period_start",
+        "period_end": "period_end",
+        "price": "price",
+        "event_date": "event_date",
+        "content": "content",
+        "category": "category_id",
+    }
+    extra_paths = ("author__image_variants",)
+
+    def to_representation(self, row):
+        data = super().to_representation(row)
+        data["author"]["image"] = get_variant_url(
+            row["author__image"], row["author__image_variants"], settings.AUTHOR_IMAGE_SIZE, self.context.get("request")
+        )
+        return data
+
+
+class EventListValuesSerializer(ValuesSerializer):
+    """
+    EventListSerializers와 같은 응답 (목록/검색 fast path)
+    """
+    fields = {
+        "id": "id",
+        "profile_image": "author__image",
+        "nickname": "author__nickname",
+        "category_name": "category__name",
+        "title": "title",
+        "price": "price",
+        "event_date": "event_date",
+        "created_at": "created_at",
+        "period_start": "period_start",
+        "period_end": "period_end",
+    }
+    extra_paths = ("author__image_variants",)
+
+    def to_representation(self, row):
+        data = super().to_representation(row)
+        data["profile_image"] = get_variant_url(
+            row["author__image"], row["author__image_variants"], settings.EVENT_LIST_AUTHOR_IMAGE_SIZE, self.context.get("request")
+        )
+        return data
+
+
 class SeatSerializers(serializers.ModelSerializer):
     seat = serializers.ListField(
         child=serializers.CharField(), 
@@ -69,14 +140,99 @@ class SeatSerializers(serializers.ModelSerializer):
 
         seats = [Seat(event=event, position=position) for position in seat_positions]
         
-        Seat.objects.bulk_create(seats)
+        created_seats = Seat.objects.bulk_create(seats, batch_size=settings.SEAT_BULK_CREATE_BATCH_SIZE)
+        invalidate_availability(event.id)
+        invalidate_inventory(event.id)
+        bump_generation(Seat)  # bulk_create는 post_save가 발생하지 않음
 
-        created_seats = Seat.objects.filter(event=event, position__in=seat_positions)
-        
-        return list(created_seats) 
+        return created_seats
 
     def get_optimized_queryset():
         return Seat.objects.all()
+
+
+class SeatValuesSerializer(ValuesSerializer):
+    """
+    SeatSerializers와 같은 응답 (좌석 목록 fast path)
+    """
+    fields = {"id": "id", "event": "event_id", "position": "position", "is_reserved": "is_reserved"}
+
+
+class SeatSectionSerializers(serializers.Serializer):
+    name = serializers.CharField(max_length=10, required=False, allow_blank=True)
+    rows = serializers.CharField(max_length=100)
+    seats = serializers.CharField(max_length=100)
+
+    def validate(self, attrs):
+        try:
+            attrs["count"] = count_section(attrs)
+        except ValueError as e:
+            raise ValidationError(str(e))
+        return attrs
+
+
+class SeatLayoutSerializers(serializers.Serializer):
+    """
+    구역/열/번호 범위(sections) 또는 다른 이벤트의 배치(copy_from)로 좌석을 일괄 생성
+    이미 있는 position은 건너뛰고, 생성 결과는 요약만 반환
+    """
+    event = serializers.PrimaryKeyRelatedField(queryset=Event.objects.all())
+    sections = SeatSectionSerializers(many=True, required=False)
+    copy_from = serializers.PrimaryKeyRelatedField(queryset=Event.objects.all(), required=False)
+
+    def validate(self, attrs):
+        if bool(attrs.get("sections")) == bool(attrs.get("copy_from")):
+            raise ValidationError("sections 또는 copy_from 중 하나만 입력해야 합니다.")
+
+        # 배치를 펼치거나 복사하기 전에 두 이벤트 모두 요청한 유저가 작성자인지 확인
+        user = self.context["request"].user
+        for event in (attrs["event"], attrs.get("copy_from")):
+            if event is not None and event.author.user_id != user.id:
+                raise PermissionDenied("이벤트 작성자만 좌석을 생성할 수 있습니다.")
+
+        if attrs.get("sections"):
+            total = sum(section["count"] for section in attrs["sections"])
+        else:
+            total = attrs["copy_from"].seats.count()
+        if total > settings.SEAT_LAYOUT_MAX_SEATS:
+            raise ValidationError(f"한 번에 생성할 수 있는 좌석은 최대 {settings.SEAT_LAYOUT_MAX_SEATS}개입니다.")
+        attrs["total"] = total
+        return attrs
+
+    def create(self, validated_data):
+        event = validated_data["event"]
+        if validated_data.get("sections"):
+            positions = expand_layout(validated_data["sections"])
+        else:
+            positions = (
+                Seat.objects.filter(event=validated_data["copy_from"]).order_by("id")
+                .values_list("position", flat=True).iterator(chunk_size=settings.SEAT_BULK_CREATE_BATCH_SIZE)
+            )
+
+        existing = set(Seat.objects.filter(event=event).values_list("position", flat=True))
+        created = 0
+        with transaction.atomic():
+            while chunk := list(islice(positions, settings.SEAT_BULK_CREATE_BATCH_SIZE)):
+                # 구역끼리 겹치거나 같은 묶음 안에서 반복되는 position도 한 번만 생성
+                new_positions = [position for position in dict.fromkeys(chunk) if position not in existing]
+                Seat.objects.bulk_create([Seat(event=event, position=position) for position in new_positions])
+                existing.update(new_positions)
+                created += len(new_positions)
+
+        invalidate_availability(event.id)
+        invalidate_inventory(event.id)
+        bump_generation(Seat)  # bulk_create는 post_save가 발생하지 않음
+
+        return {
+            "event": event.id,
+            "requested": validated_data["total"],
+            "created": created,
+            "skipped": validated_data["total"] - created,
+            "sections": [
+                {"name": section.get("name", ""), "rows": section["rows"], "seats": section["seats"], "count": section["count"]}
+                for section in validated_data.get("sections", [])
+            ],
+        }
     
 
 class ReservationSerializers(serializers.ModelSerializer):
@@ -89,7 +245,6 @@ class ReservationSerializers(serializers.ModelSerializer):
         fields = ['id', 'event_title', 'event_date', 'tickets', 'ticket_count']
 
     def create(self, validated_data):
-        print(validated_data)
         tickets = validated_data.pop('tickets')
         profile = validated_data.pop('user')
         user = profile.user
@@ -102,30 +257,69 @@ class ReservationSerializers(serializers.ModelSerializer):
         event = tickets[0].event
         validated_data['event'] = event
 
-        print("📌 예약하려는 티켓 리스트:")
-        for ticket in tickets:
-            print(f"Event ID1: {ticket.event_id}, ticket: {ticket}")
-            seat_key = f"seat_reservation: {event.id}-{ticket.id}"
-            try:
-                if not redis_client.get(seat_key):
-                    redis_client.set(seat_key, user.id)
-                    print(f"🔹 Redis Key: {redis_client.get(seat_key)}")
-                    print(f"🔹 Redis Value: {redis_client.get(seat_key)}")
-
-                    expiration_time = (datetime.now() + timedelta(hours=24)).isoformat()
-                    producer.send(
-                        "seat_reservation",
-                        {"seat_key": seat_key, "event_id": event.id, "ticket_id": ticket.id, "user_id": user.id, "status": "reserved", "expiration_time": expiration_time},
-                    )
-                else:
-                    raise ValidationError("이미 예약된 좌석입니다.")
-            except Exception as e:
-                redis_client.delete(seat_key)
-                raise ValidationError(f"예약 중 오류 발생: {str(e)}")
+        if settings.ADMISSION_REQUIRED and not is_admitted(user.id, event.id):
+            raise PermissionDenied("대기열을 통해 입장한 유저만 좌석을 선택할 수 있습니다.")
+
+        if is_sold_out(event.id):
+            raise ValidationError("매진된 이벤트입니다.")
+
+        ticket_ids = [ticket.id for ticket in tickets]
+        # 판매된 좌석 Set이 비어 있는 경우(Redis 유실, 이전에 판매된 좌석)에도 다시 팔리지 않도록 DB도 확인
+        sold = sorted(Reservation.tickets.through.objects.filter(seat_id__in=ticket_ids).values_list("seat_id", flat=True))
+        if sold:
+            raise ValidationError({"detail": "이미 예약된 좌석입니다.", "conflicts": sold})
+
+        conflicts = hold_seats(event.id, ticket_ids, user.id)
+        if conflicts:
+            raise ValidationError({"detail": "이미 예약된 좌석입니다.", "conflicts": conflicts})
+
+        expiration_time = (datetime.now() + timedelta(seconds=settings.SEAT_HOLD_TTL)).isoformat()
+        try:
+            enqueue(
+                "seat_reservation",
+                [
+                    {"seat_key": get_seat_key(event.id, ticket_id), "event_id": event.id, "ticket_id": ticket_id, "user_id": user.id, "status": "reserved", "expiration_time": expiration_time}
+                    for ticket_id in ticket_ids
+                ],
+                key=event.id,
+            )
+        except Exception as e:
+            release_seats(event.id, ticket_ids, user.id)
+            raise ValidationError(f"예약 중 오류 발생: {str(e)}")
     
         reservation = self.Meta.model(id=None, event=event, user=profile)
         
         return reservation
     
     def get_optimized_queryset():
-        return Reservation.objects.all()
+        return (
+            Reservation.objects.select_related("event")
+            .annotate(ticket_total=Count("tickets", distinct=True))
+            .prefetch_related(Prefetch("tickets", queryset=Seat.objects.only("id")))
+        )
+
+
+
+class ReservationValuesSerializer(ValuesSerializer):
+    """
+    ReservationSerializers와 같은 응답 (내 예매 내역 fast path)
+    tickets는 페이지의 예매 id로 중간 테이블을 한 번 조회해 채움
+    """
+    fields = {
+        "id": "id",
+        "event_title": "event__title",
+        "event_date": "event__event_date",
+        "tickets": "id",
+        "ticket_count": "ticket_total",
+    }
+
+    def prepare(self, rows):
+        self.tickets = {row["id"]: [] for row in rows}
+        through = Reservation.tickets.through.objects.filter(reservation_id__in=self.tickets).order_by("id")
+        for reservation_id, seat_id in through.values_list("reservation_id", "seat_id"):
+            self.tickets[reservation_id].append(seat_id)
+
+    def to_representation(self, row):
+        data = super().to_representation(row)
+        data["tickets"] = self.tickets[row["id"]]
+        return data
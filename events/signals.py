@@ -1,50 +1,107 @@
 import json
+from django.conf import settings
 from django.db.models.signals import post_migrate
 from django.dispatch import receiver
 from django_celery_beat.models import PeriodicTask, IntervalSchedule
 
 
 @receiver(post_migrate)
-def create_batch_update_last_login(sender, **kwargs):
+def remove_batch_process_queue_entry(sender, **kwargs):
+    # 입장 처리는 admission 서비스(manage.py run_admission)가 담당하므로 이전에 만들어진 Beat 작업은 제거
+    if sender.name == "django_celery_beat":
+        deleted, _ = PeriodicTask.objects.filter(name="실시간 대기열 처리").delete()
+        if deleted:
+            print("✔ 실시간 대기열 처리 작업이 삭제되었습니다.")
+
+
+@receiver(post_migrate)
+def create_batch_check_reservation(sender, **kwargs):
     if sender.name == "django_celery_beat":
         schedule, _ = IntervalSchedule.objects.get_or_create(
-            every=60,
+            every=86400,
             period=IntervalSchedule.SECONDS,
         )
 
         task, created = PeriodicTask.objects.get_or_create(
-            name="실시간 대기열 처리",
+            name="예매 취소 & 확정 처리",
             defaults={
                 "interval": schedule,
-                "task": "events.tasks.process_queue_entry",
+                "task": "events.tasks.check_reservation_task",
                 "args": json.dumps([]),
             }
         )
 
         if created:
-            print("✔ 실시간 대기열 처리 작업이 생성되었습니다.")
+            print("✔ 예매 취소 & 확정 처리 작업이 생성되었습니다.")
         else:
-            print("⚠ 실시간 대기열 처리은 이미 존재하는 주기적 작업입니다.")
+            print("⚠ 예매 취소 & 확정 처리은 이미 존재하는 주기적 작업입니다.")
 
 
 @receiver(post_migrate)
-def create_batch_check_reservation(sender, **kwargs):
+def create_batch_release_expired_holds(sender, **kwargs):
     if sender.name == "django_celery_beat":
         schedule, _ = IntervalSchedule.objects.get_or_create(
-            every=86400,
+            every=5,
             period=IntervalSchedule.SECONDS,
         )
 
         task, created = PeriodicTask.objects.get_or_create(
-            name="예매 취소 & 확정 처리",
+            name="만료된 좌석 선점 해제",
             defaults={
                 "interval": schedule,
-                "task": "events.tasks.check_reservation_task",
+                "task": "events.tasks.release_expired_holds_task",
                 "args": json.dumps([]),
             }
         )
 
         if created:
-            print("✔ 예매 취소 & 확정 처리 작업이 생성되었습니다.")
+            print("✔ 만료된 좌석 선점 해제 작업이 생성되었습니다.")
+        else:
+            print("⚠ 만료된 좌석 선점 해제은 이미 존재하는 주기적 작업입니다.")
+
+
+@receiver(post_migrate)
+def create_batch_relay_outbox(sender, **kwargs):
+    # outbox를 쓸 때만 등록 (이미 등록된 작업은 relay_outbox_task가 설정을 보고 바로 종료)
+    if sender.name == "django_celery_beat" and settings.KAFKA_OUTBOX:
+        schedule, _ = IntervalSchedule.objects.get_or_create(
+            every=1,
+            period=IntervalSchedule.SECONDS,
+        )
+
+        task, created = PeriodicTask.objects.get_or_create(
+            name="Kafka outbox 전송",
+            defaults={
+                "interval": schedule,
+                "task": "events.tasks.relay_outbox_task",
+                "args": json.dumps([]),
+            }
+        )
+
+        if created:
+            print("✔ Kafka outbox 전송 작업이 생성되었습니다.")
+        else:
+            print("⚠ Kafka outbox 전송은 이미 존재하는 주기적 작업입니다.")
+
+
+@receiver(post_migrate)
+def create_batch_reconcile_inventory(sender, **kwargs):
+    if sender.name == "django_celery_beat":
+        schedule, _ = IntervalSchedule.objects.get_or_create(
+            every=60,
+            period=IntervalSchedule.SECONDS,
+        )
+
+        task, created = PeriodicTask.objects.get_or_create(
+            name="잔여 좌석 카운터 보정",
+            defaults={
+                "interval": schedule,
+                "task": "events.tasks.reconcile_inventory_task",
+                "args": json.dumps([]),
+            }
+        )
+
+        if created:
+            print("✔ 잔여 좌석 카운터 보정 작업이 생성되었습니다.")
         else:
-            print("⚠ 예매 취소 & 확정 처리은 이미 존재하는 주기적 작업입니다.")
\ No newline at end of file
+            print("⚠ 잔여 좌석 카운터 보정은 이미 존재하는 주기적 작업입니다.")
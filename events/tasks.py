@@ -1,24 +1,64 @@
 # app/tasks.py
+import logging
+
 from celery import shared_task
-import redis
-from core.consumers import check_reservations
+from django.conf import settings
+
+from core.consumers import check_reservations, check_reservations_batch
+from core.producer import relay_outbox
+from events.admission import admit_all
+from events.inventory import reconcile_inventory
+from events.seat_holds import release_expired_holds
 
-redis_client = redis.StrictRedis(host="redis", port=6379, db=0, decode_responses=True)
-QUEUE_NAME = "ticketing_queue"
+logger = logging.getLogger(__name__)
 
 @shared_task
 def process_queue_entry():
     """
-    1초마다 10명씩 좌석 선택 페이지로 입장
+    입장 스케줄러 한 틱 수동 실행 (Beat에는 등록하지 않음, 평소 입장 처리는 `manage.py run_admission` 서비스가 담당)
     """
-    for _ in range(10):  # 한 번 실행할 때 최대 10명 입장 처리
-        message_data = redis_client.zpopmin(QUEUE_NAME)
-        if not message_data:
-            break
-
-        print(f"User {message_data} is now allowed to enter ticket selection page")
+    for queue_key, user_ids in admit_all().items():
+        logger.info("%s: %s명 입장 (%s)", queue_key, len(user_ids), user_ids)
 
 
 @shared_task(queue="kafka-celery")
 def check_reservation_task():
-    check_reservations()
\ No newline at end of file
+    """
+    Celery 워커 한 슬롯에서 consumer 실행 (운영에서는 `manage.py run_reservation_consumer --workers N` 권장)
+    """
+    if settings.RESERVATION_CONSUMER_BATCH:
+        check_reservations_batch()
+    else:
+        check_reservations()
+
+
+@shared_task
+def release_expired_holds_task():
+    """
+    만료된 좌석 선점을 해제해 다시 판매 가능 상태로 돌림
+    """
+    for event_id, ticket_ids in release_expired_holds().items():
+        logger.info("이벤트 %s: 만료된 선점 %s석 해제", event_id, len(ticket_ids))
+
+
+@shared_task
+def reconcile_inventory_task():
+    """
+    잔여 좌석 카운터를 DB 기준으로 보정
+    """
+    for event_id, (previous, remaining) in reconcile_inventory().items():
+        logger.info("이벤트 %s: 잔여 좌석 카운터 보정 %s -> %s", event_id, previous, remaining)
+
+
+@shared_task
+def relay_outbox_task():
+    """
+    outbox에 쌓인 Kafka 메시지를 모두 전송 (KAFKA_OUTBOX가 꺼져 있으면 outbox를 쓰지 않으므로 바로 종료)
+    """
+    if not settings.KAFKA_OUTBOX:
+        return
+
+    sent = relay_outbox()
+    while sent:
+        logger.info("outbox 메시지 %s건 전송", sent)
+        sent = relay_outbox()
@@ -1,3 +1,179 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+import fakeredis
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from accounts.models import Profile, User
+from core import redis as core_redis
+from events.availability import get_availability_key, rebuild_availability
+from events.inventory import get_remaining_seats
+from events.models import Category, Event, Seat
+from events.seat_holds import (
+    HOLD_EVENTS_KEY,
+    clear_confirmed_holds,
+    extend_hold,
+    get_hold_expiry_key,
+    get_seat_key,
+    hold_seats,
+    release_expired_holds,
+    release_seats,
+    release_sold_seats,
+)
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "sessions": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "sessions"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SeatHoldTests(TestCase):
+    """ events.seat_holds 선점 스크립트 (fakeredis의 Lua 지원으로 실행) """
+
+    def setUp(self):
+        # 모든 role의 Redis 클라이언트를 테스트마다 새 fakeredis 서버로 교체
+        server = fakeredis.FakeServer()
+        clients = {
+            (role, decode): fakeredis.FakeRedis(server=server, decode_responses=decode)
+            for role in settings.REDIS_URLS
+            for decode in (True, False)
+        }
+        patcher = mock.patch.dict(core_redis._clients, clients)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.redis = core_redis.get_redis("holds")
+
+        user = User.objects.create_user(
+            "author@example.com", "password", name="author", phone_number="01012345678", birthday="2000-01-01"
+        )
+        event = Event.objects.create(
+            category=Category.objects.create(name="concert"),
+            author=Profile.objects.get(user=user),
+            title="event",
+            period_start="2024-01-01",
+            period_end="2024-02-01",
+            price=1000,
+            event_date="2024-03-01",
+            content="content",
+        )
+        self.event_id = event.id
+        self.seats = [Seat.objects.create(event=event, position=f"A{i}").id for i in range(3)]
+
+        # bitmap과 잔여 좌석 카운터를 미리 만들어 스크립트가 함께 갱신하는지 확인
+        rebuild_availability(self.event_id)
+        self.assertEqual(get_remaining_seats([self.event_id]), [3])
+
+    def remaining(self):
+        return get_remaining_seats([self.event_id])[0]
+
+    def available(self, seat_id):
+        bitmap = core_redis.get_redis("holds", decode=False)
+        return bitmap.getbit(get_availability_key(self.event_id), self.seats.index(seat_id)) == 1
+
+    def test_hold_is_all_or_nothing(self):
+        s1, s2, _ = self.seats
+        self.assertEqual(hold_seats(self.event_id, [s1], 1), [])
+
+        conflicts = hold_seats(self.event_id, [s1, s2], 2)
+
+        self.assertEqual(conflicts, [s1])
+        self.assertEqual(self.redis.get(get_seat_key(self.event_id, s1)), "1")
+        self.assertIsNone(self.redis.get(get_seat_key(self.event_id, s2)))
+        self.assertTrue(self.available(s2))
+        self.assertEqual(self.remaining(), 2)
+
+    def test_hold_updates_inventory_and_bitmap(self):
+        s1, s2, s3 = self.seats
+
+        self.assertEqual(hold_seats(self.event_id, [s1, s2], 1), [])
+        # 같은 유저의 재선점은 카운터를 다시 줄이지 않음
+        self.assertEqual(hold_seats(self.event_id, [s1], 1), [])
+
+        self.assertEqual(self.remaining(), 1)
+        self.assertFalse(self.available(s1))
+        self.assertFalse(self.available(s2))
+        self.assertTrue(self.available(s3))
+        self.assertEqual(self.redis.zcard(get_hold_expiry_key(self.event_id)), 2)
+
+    def test_release_only_own_holds(self):
+        s1, s2, _ = self.seats
+        hold_seats(self.event_id, [s1, s2], 1)
+
+        self.assertEqual(release_seats(self.event_id, [s1], 2), 0)
+        self.assertEqual(release_seats(self.event_id, [s1], 1), 1)
+
+        self.assertIsNone(self.redis.get(get_seat_key(self.event_id, s1)))
+        self.assertTrue(self.available(s1))
+        self.assertFalse(self.available(s2))
+        self.assertEqual(self.remaining(), 2)
+        self.assertEqual(hold_seats(self.event_id, [s1], 2), [])
+
+    def test_release_expired_holds(self):
+        s1, s2, _ = self.seats
+        hold_seats(self.event_id, [s1], 1, ttl=10)
+        hold_seats(self.event_id, [s2], 2, ttl=100)
+
+        self.assertEqual(release_expired_holds(now=time.time()), {})
+        released = release_expired_holds(now=time.time() + 11)
+
+        self.assertEqual(released, {str(self.event_id): [str(s1)]})
+        self.assertIsNone(self.redis.get(get_seat_key(self.event_id, s1)))
+        self.assertTrue(self.available(s1))
+        self.assertFalse(self.available(s2))
+        self.assertEqual(self.remaining(), 2)
+        self.assertTrue(self.redis.sismember(HOLD_EVENTS_KEY, self.event_id))
+
+        release_expired_holds(now=time.time() + 101)
+        self.assertEqual(self.remaining(), 3)
+        self.assertFalse(self.redis.sismember(HOLD_EVENTS_KEY, self.event_id))
+
+    def test_extend_hold(self):
+        s1, _, _ = self.seats
+        hold_seats(self.event_id, [s1], 1, ttl=10)
+
+        self.assertFalse(extend_hold(self.event_id, s1, 2, 100))
+        self.assertTrue(extend_hold(self.event_id, s1, 1, 100))
+
+        self.assertGreater(self.redis.pttl(get_seat_key(self.event_id, s1)), 10 * 1000)
+        # 키 TTL이 늘어나도 만료 ZSet에 남아 있어 끝내 확정되지 않으면 만료 처리기가 해제
+        self.assertEqual(release_expired_holds(now=time.time() + 11), {})
+        self.assertEqual(release_expired_holds(now=time.time() + 101), {str(self.event_id): [str(s1)]})
+        self.assertEqual(self.remaining(), 3)
+
+    def test_confirmed_seat_cannot_be_held_again(self):
+        s1, _, _ = self.seats
+        hold_seats(self.event_id, [s1], 1)
+
+        self.assertEqual(clear_confirmed_holds(self.event_id, [(s1, 1)]), 1)
+
+        self.assertIsNone(self.redis.get(get_seat_key(self.event_id, s1)))
+        self.assertEqual(self.redis.zcard(get_hold_expiry_key(self.event_id)), 0)
+        self.assertEqual(hold_seats(self.event_id, [s1], 2), [s1])
+        self.assertEqual(hold_seats(self.event_id, [s1], 1), [s1])
+        # 판매된 좌석은 만료 처리로 되돌아오지 않음
+        self.assertEqual(release_expired_holds(now=time.time() + settings.SEAT_HOLD_TTL + 1), {})
+        self.assertFalse(self.available(s1))
+        self.assertEqual(self.remaining(), 2)
+
+    def test_clear_confirmed_keeps_other_users_hold(self):
+        s1, _, _ = self.seats
+        hold_seats(self.event_id, [s1], 2)
+
+        self.assertEqual(clear_confirmed_holds(self.event_id, [(s1, 1)]), 0)
+
+        self.assertEqual(self.redis.get(get_seat_key(self.event_id, s1)), "2")
+        self.assertEqual(self.redis.zcard(get_hold_expiry_key(self.event_id)), 1)
+
+    def test_release_sold_seats(self):
+        s1, _, _ = self.seats
+        hold_seats(self.event_id, [s1], 1)
+        clear_confirmed_holds(self.event_id, [(s1, 1)])
+
+        self.assertEqual(release_sold_seats(self.event_id, [s1]), 1)
+        self.assertEqual(release_sold_seats(self.event_id, [s1]), 0)
+
+        self.assertTrue(self.available(s1))
+        self.assertEqual(self.remaining(), 3)
+        self.assertEqual(hold_seats(self.event_id, [s1], 2), [])
@@ -4,7 +4,7 @@ from rest_framework.routers import DefaultRouter
 
 from events.views import CategoryViewSet, EventViewSet, seatViewSet, ReservationViewSet
 
-from .views import enter_ticket_page, TicketConfirmedView
+from .views import enter_ticket_page, aenter_ticket_page, TicketConfirmedView
 
 router = DefaultRouter()
 router.register(r"category", CategoryViewSet)
@@ -16,5 +16,6 @@ router.register(r"reservations", ReservationViewSet)
 urlpatterns = [
     path("", include(router.urls)),
     path("redis-ticket-page/", enter_ticket_page, name="ticket_page"),
+    path("redis-ticket-page/async/", aenter_ticket_page, name="ticket_page_async"),
     path("ticket-confirmed/", TicketConfirmedView.as_view(), name="ticket_confirmed"),
 ]
\ No newline at end of file
@@ -1,53 +1,125 @@
-from django.core.cache import cache
+import logging
 from datetime import datetime, timedelta
 
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from rest_framework.viewsets import GenericViewSet
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 
-from .models import Seat
+from .filters import EventFilterBackend
+from .search import search_events
+from .pagination import EventCursorPagination, ReservationCursorPagination
+from .availability import get_packed_availability, get_seat_layout
+from .inventory import ais_sold_out, get_remaining_seats, is_sold_out
 from core.permissions import IsAuthorOrReadOnly, IsOwner
-from events.serializers import CategorySerializers, EventSerializers, EventListSerializers, SeatSerializers, ReservationSerializers
-from core.producer import producer
+from events.serializers import (
+    CategorySerializers,
+    EventSerializers,
+    EventListSerializers,
+    EventValuesSerializer,
+    EventListValuesSerializer,
+    SeatSerializers,
+    SeatLayoutSerializers,
+    SeatValuesSerializer,
+    ReservationSerializers,
+    ReservationValuesSerializer,
+)
+from core.idempotency import idempotent
+from core.producer import enqueue
 from core.mixins import (
+    CacheResponseMixin,
     CreateModelMixin,
     LoggerMixin, 
     RetrieveModelMixin,
     ListModelMixin,
     UpdateModelMixin, 
     DestroyModelMixin, 
-    MappingViewSetMixin
+    MappingViewSetMixin,
+    ValuesSerializerMixin,
 )
 
 
-class CategoryViewSet(GenericViewSet, CreateModelMixin, ListModelMixin, UpdateModelMixin, DestroyModelMixin):
+class CategoryViewSet(CacheResponseMixin, GenericViewSet, CreateModelMixin, ListModelMixin, UpdateModelMixin, DestroyModelMixin):
     serializer_class = CategorySerializers
     queryset = CategorySerializers.get_optimized_queryset()
+
+    cache_actions = {"list": ()}
+    cache_invalidate_models = ("events.Category",)
     
 
-class EventViewSet(MappingViewSetMixin, GenericViewSet, CreateModelMixin, RetrieveModelMixin, ListModelMixin, UpdateModelMixin, DestroyModelMixin):
+class EventViewSet(CacheResponseMixin, ValuesSerializerMixin, MappingViewSetMixin, GenericViewSet, CreateModelMixin, RetrieveModelMixin, ListModelMixin, UpdateModelMixin, DestroyModelMixin):
     serializer_class=EventSerializers
     serializer_action_map = {
         "create": EventSerializers,
         "retrieve": EventSerializers,
         "list": EventListSerializers,
+        "search": EventListSerializers,
         "update": EventSerializers,
     }
+    values_serializer_action_map = {
+        "retrieve": EventValuesSerializer,
+        "list": EventListValuesSerializer,
+        "search": EventListValuesSerializer,
+    }
     queryset = EventSerializers.get_optimized_queryset().select_related("author","author__user","category")
 
     permission_classes = [IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
+    pagination_class = EventCursorPagination
+    filter_backends = [EventFilterBackend]
+
+    cache_actions = {
+        "list": ("cursor", "page_size", "category", "date_from", "date_to", "on_sale"),
+        "search": ("q", "cursor", "page_size", "category", "date_from", "date_to", "on_sale"),
+        "retrieve": (),
+    }
+    cache_invalidate_models = ("events.Event", "events.Category", "accounts.Profile", "accounts.User")
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user.profile)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        제목/내용 전문 검색 (?q=검색어, list와 같은 필터/페이지네이션 지원)
+        """
+        if not request.query_params.get("q", "").strip():
+            raise ValidationError({"q": "검색어가 필요합니다."})
+        return self.list(request)
+
+    def add_live_data(self, data):
+        """
+        목록/상세 응답에 잔여 좌석 수(remaining_seats)를 덧붙임 (응답 캐시와 별개로 매 요청 Redis에서 읽음)
+        """
+        if self.action == "retrieve":
+            remaining = get_remaining_seats([data["id"]])
+            return {**data, "remaining_seats": remaining[0]}, remaining
+
+        results = data["results"]
+        remaining = get_remaining_seats([event["id"] for event in results])
+        results = [{**event, "remaining_seats": count} for event, count in zip(results, remaining)]
+        return {**data, "results": results}, remaining
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "search":
+            queryset = search_events(queryset, self.request.query_params["q"])
+        return queryset
     
 
-class seatViewSet(MappingViewSetMixin, GenericViewSet, CreateModelMixin, ListModelMixin):
+class seatViewSet(CacheResponseMixin, ValuesSerializerMixin, MappingViewSetMixin, GenericViewSet, CreateModelMixin, ListModelMixin):
     serializer_class = SeatSerializers
+    serializer_action_map = {
+        "generate": SeatLayoutSerializers,
+    }
+    values_serializer_action_map = {"list": SeatValuesSerializer}
     queryset = SeatSerializers.get_optimized_queryset()
+    permission_classes = [IsAuthenticatedOrReadOnly]
 
+    cache_actions = {"list": ("event_id",)}
+    cache_invalidate_models = ("events.Seat",)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -58,26 +130,88 @@ class seatViewSet(MappingViewSetMixin, GenericViewSet, CreateModelMixin, ListMod
         return Response(response_serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
     def list(self: GenericViewSet | LoggerMixin, request, *args, **kwargs):
-        event_id = self.request.query_params.get('event_id')
+        event_id = self.get_event_id()
+
+        if event_id is None:
+            return Response({"error":"event_id 값이 없습니다."})
 
+        return super().list(request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            queryset = queryset.filter(event_id=self.get_event_id())
+        return queryset
+
+    def get_event_id(self):
+        """
+        ?event_id= 값을 정수로 반환 (없으면 None, 숫자가 아니면 400)
+        """
+        event_id = self.request.query_params.get('event_id')
         if not event_id:
+            return None
+        try:
+            return int(event_id)
+        except ValueError:
+            raise ValidationError({"event_id": "정수여야 합니다."})
+
+    @action(detail=False, methods=["post"])
+    def generate(self, request, *args, **kwargs):
+        """
+        구역/열/번호 범위로 대규모 좌석을 서버에서 생성하고 요약만 반환
+        {"event": 1, "sections": [{"name": "A", "rows": "A-Z", "seats": "1-200"}]}
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        summary = serializer.save()
+        return Response(summary, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["get"])
+    def layout(self, request, *args, **kwargs):
+        """
+        좌석 배치 (ordinal 순 [seat_id, position] 목록)
+        version이 같으면 내용이 바뀌지 않으므로 ?version= 으로 요청하면 영구 캐싱 가능
+        """
+        event_id = self.get_event_id()
+
+        if event_id is None:
             return Response({"error":"event_id 값이 없습니다."})
-        
-        cache_key = f"event_{event_id}_seats"
-        seats_data = cache.get(cache_key)
 
-        if not seats_data:
-            seats = Seat.objects.select_related('event').prefetch_related('reservations').filter(event_id=event_id)
-            seats_data = self.serializer_class(seats, many=True).data
-            cache.set(cache_key, seats_data, timeout=60*15) 
+        version, seats = get_seat_layout(event_id)
+        response = Response({"event": event_id, "version": version, "seats": seats})
+        response["ETag"] = f'"{version}"'
+        if self.request.query_params.get('version') == version:
+            response["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+    @action(detail=False, methods=["get"])
+    def availability(self, request, *args, **kwargs):
+        """
+        좌석 잔여 현황 bitmap (base64, layout의 ordinal마다 1bit, 1 = 예매 가능)
+        """
+        event_id = self.get_event_id()
+
+        if event_id is None:
+            return Response({"error":"event_id 값이 없습니다."})
 
-        return Response(seats_data)
+        return Response(get_packed_availability(event_id))
     
 
-class ReservationViewSet(MappingViewSetMixin, GenericViewSet, CreateModelMixin, ListModelMixin, DestroyModelMixin):
+class ReservationViewSet(ValuesSerializerMixin, MappingViewSetMixin, GenericViewSet, CreateModelMixin, ListModelMixin, DestroyModelMixin):
     serializer_class=ReservationSerializers
     queryset=ReservationSerializers.get_optimized_queryset()
+    values_serializer_action_map = {"list": ReservationValuesSerializer}
     permission_classes = [IsAuthenticated, IsOwner]
+    pagination_class = ReservationCursorPagination
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        ticket_ids = list(instance.tickets.values_list("id", flat=True))
+        super().perform_destroy(instance)
+        release_sold_seats(instance.event_id, ticket_ids)  # 취소된 좌석을 다시 예매할 수 있도록
 
     def perform_create(self, serializer):
         instance= serializer.save(user=self.request.user.profile)
@@ -94,12 +228,22 @@ class ReservationViewSet(MappingViewSetMixin, GenericViewSet, CreateModelMixin,
 ############# redis를 이용한 대기열 시스템 #############
 import json
 import time
-import redis
-from django.http import StreamingHttpResponse
-from .queue_manager import add_user_to_queue, remove_user_from_queue
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from .admission import ais_admitted, is_admitted
+from .queue_manager import add_user_to_queue, aadd_user_to_queue, get_queue_position, aget_queue_position, get_serving_channel
+from .seat_holds import extend_hold, get_seat_key, release_sold_seats
+from .waiting_room import serving_listener
+from core.redis import get_redis
+
+logger = logging.getLogger(__name__)
 
-redis_client = redis.StrictRedis(host="redis", port=6379, db=0, decode_responses=True)
-QUEUE_NAME = "ticketing_queue"
+def get_queue_event_id(request):
+    """
+    ?event_id= 값을 정수로 반환 (없으면 공용 대기열 None, 숫자가 아니면 ValueError)
+    """
+    event_id = request.GET.get("event_id")
+    return int(event_id) if event_id else None
 
 def enter_ticket_page(request):
     """
@@ -107,30 +251,31 @@ def enter_ticket_page(request):
     2. SSE를 통해 실시간 순번 확인
     """
     user_id = request.user.id
+    try:
+        event_id = get_queue_event_id(request)
+    except ValueError:
+        return JsonResponse({"event_id": "정수여야 합니다."}, status=400)
+
+    if event_id and is_sold_out(event_id):
+        return JsonResponse({"error": "매진된 이벤트입니다."}, status=409)
 
-    add_user_to_queue(user_id)  # Redis ZSet에 유저 추가
-    return StreamingHttpResponse(event_stream(user_id), content_type="text/event-stream")
+    add_user_to_queue(user_id, event_id)  # Redis ZSet에 유저 추가
+    return StreamingHttpResponse(event_stream(user_id, event_id), content_type="text/event-stream")
 
-def event_stream(user_id):
+def event_stream(user_id, event_id=None):
     """
     SSE를 통해 실시간으로 대기열 순번을 확인
     """
     while True:
         try:
-            users = redis_client.zrange(QUEUE_NAME, 0, -1, withscores=True)
-            total_user = len(users)
-            position = None
-
-            for index, (user_data, _) in enumerate(users):
-
-                user_info = json.loads(user_data)
-                if user_info.get("user_id") == user_id:
-
-                    position = index + 1
-                    break
-
-            if position <= 10: 
-                yield f"data: {json.dumps({'position': position, 'total_user':total_user, 'redirect': '/select-seat/'})}\n\n"
+            position, total_user = get_queue_position(user_id, event_id)
+
+            # 대기열에서 빠졌다면 입장 처리되었는지 확인 (입장한 유저만 좌석 선택 페이지로 이동)
+            if position is None:
+                if is_admitted(user_id, event_id):
+                    yield f"data: {json.dumps({'position': position, 'total_user':total_user, 'redirect': '/select-seat/'})}\n\n"
+                else:
+                    yield f"data: {json.dumps({'position': position, 'total_user':total_user, 'status': 'NOT_IN_QUEUE'})}\n\n"
                 break  # SSE 종료 → 클라이언트는 리디렉션 처리
 
             else:
@@ -139,12 +284,66 @@ def event_stream(user_id):
             time.sleep(5)  # 5초마다 업데이트
 
         except Exception as e:
-            print(f"Error in SSE: {e}")
+            logger.exception("Error in SSE: %s", e)
             break
 
 
+async def aenter_ticket_page(request):
+    """
+    enter_ticket_page의 ASGI 버전
+    워커 스레드를 점유하지 않고, 대기열 앞이 진행될 때만 순번을 push
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"error": "로그인이 필요합니다."}, status=401)
+
+    try:
+        event_id = get_queue_event_id(request)
+    except ValueError:
+        return JsonResponse({"event_id": "정수여야 합니다."}, status=400)
+
+    if event_id and await ais_sold_out(event_id):
+        return JsonResponse({"error": "매진된 이벤트입니다."}, status=409)
+
+    seq = await aadd_user_to_queue(user.id, event_id)
+    return StreamingHttpResponse(aevent_stream(user.id, seq, event_id), content_type="text/event-stream")
+
+async def aevent_stream(user_id, seq, event_id=None):
+    """
+    "현재 입장 순번" 발행을 받아 SSE로 순번을 전달
+    """
+    channel = get_serving_channel(event_id)
+    try:
+        position, total_user = await aget_queue_position(user_id, event_id)
+        while True:
+            if position is None:
+                if await ais_admitted(user_id, event_id):
+                    yield f"data: {json.dumps({'position': position, 'total_user':total_user, 'redirect': '/select-seat/'})}\n\n"
+                else:
+                    yield f"data: {json.dumps({'position': position, 'total_user':total_user, 'status': 'NOT_IN_QUEUE'})}\n\n"
+                break
+
+            yield f"data: {json.dumps({'position': position, 'total_user':total_user, 'status': 'WAIT'})}\n\n"
+
+            serving = await serving_listener.wait(channel, timeout=settings.SSE_KEEPALIVE)
+            if serving is None:
+                # 순번을 읽은 뒤 기다리기 전에 발행된 입장 알림은 놓칠 수 있으므로 실제 순번을 다시 확인
+                # (다음 WAIT 응답이 프록시가 유휴 연결을 끊지 않도록 하는 keepalive 역할도 함)
+                position, total_user = await aget_queue_position(user_id, event_id)
+                continue
+
+            # 내 순번 - 마지막 입장 순번 (중간 이탈자까지 포함한 상한값)
+            position, total_user = seq - serving["serving"], serving["total_user"]
+            if position <= 0:  # 입장 처리되었을 수 있으므로 실제 순번 확인
+                position, total_user = await aget_queue_position(user_id, event_id)
+
+    except Exception as e:
+        logger.exception("Error in SSE: %s", e)
+
+
 # 결제 확인
 class TicketConfirmedView(APIView):
+    @idempotent
     def post(self, request):
         event_id = request.data.get("event_id")
         ticket_id = request.data.get("ticket_id")
@@ -153,23 +352,25 @@ class TicketConfirmedView(APIView):
         if not all([event_id, ticket_id, user_id]):
             raise ValidationError("event_id, ticket_id, user_id가 필요합니다.")
 
-        seat_key = f"seat_reservation: {event_id}-{ticket_id}"
-        # 기존 예약 정보 가져오기
-        print("seat_key:", seat_key)
-        existing_user_id = redis_client.get(seat_key)
-        print("user_id", existing_user_id)
-        if not existing_user_id:
-            raise ValidationError("예약 정보가 존재하지 않습니다.")
-
-        if int(existing_user_id) != user_id:
+        seat_key = get_seat_key(event_id, ticket_id)
+        # 본인 선점인지 확인하고 consumer가 확정할 때까지 만료되지 않도록 연장 (끝내 확정되지 않으면 만료 처리기가 해제)
+        if not extend_hold(event_id, ticket_id, user_id, settings.SEAT_CONFIRM_TTL):
+            if not get_redis("holds").exists(seat_key):
+                raise ValidationError("예약 정보가 존재하지 않습니다.")
             raise ValidationError("해당 좌석의 예약자가 아닙니다.")
 
-        # Kafka 이벤트 전송
-        expiration_time = (datetime.now() + timedelta(hours=24)).isoformat()
+        # Kafka 이벤트 전송 (선점과 같은 시각에 만료되어 consumer가 만료된 선점을 확정하지 않도록)
+        expiration_time = (datetime.now() + timedelta(seconds=settings.SEAT_CONFIRM_TTL)).isoformat()
 
-        producer.send(
-            "seat_reservation",
-            {"seat_key": seat_key, "event_id": event_id, "ticket_id": ticket_id, "user_id": user_id, "status": "confirmed", "expiration_time": expiration_time},
-        )
+        try:
+            enqueue(
+                "seat_reservation",
+                [{"seat_key": seat_key, "event_id": event_id, "ticket_id": ticket_id, "user_id": user_id, "status": "confirmed", "expiration_time": expiration_time}],
+                key=event_id,
+            )
+        except Exception:
+            # 확정 메시지가 나가지 않았으므로 선점을 원래 길이로 되돌림 (다시 확정 요청 가능)
+            extend_hold(event_id, ticket_id, user_id, settings.SEAT_HOLD_TTL)
+            raise
 
         return Response({"message": "좌석 예약이 확정되었습니다."}, status=200)
\ No newline at end of file
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import logging
+
+from core.redis import get_async_redis
+from .queue_manager import QUEUE_NAME
+
+logger = logging.getLogger(__name__)
+
+
+class ServingListener:
+    """
+    프로세스당 하나의 pub/sub 연결로 "현재 입장 순번" 발행을 받아
+    같은 대기열을 기다리는 SSE 연결들을 한 번에 깨움
+    (연결마다 Redis 구독/폴링을 하지 않기 위함)
+    """
+
+    def __init__(self, pattern=f"{QUEUE_NAME}*:serving", retry_delay=1):
+        self.pattern = pattern
+        self.retry_delay = retry_delay
+        self._waiters = {}
+        self._task = None
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+
+    async def wait(self, channel, timeout):
+        """
+        channel에 새 순번이 발행될 때까지 기다렸다가 발행 내용을 반환
+        timeout 동안 아무 발행이 없으면 None
+        """
+        self._ensure_started()
+        future = self._waiters.get(channel)
+        if future is None or future.done():
+            future = asyncio.get_running_loop().create_future()
+            self._waiters[channel] = future
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def _listen(self):
+        while True:
+            pubsub = get_async_redis("queue").pubsub()
+            try:
+                await pubsub.psubscribe(self.pattern)
+                async for message in pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    future = self._waiters.pop(message["channel"], None)
+                    if future is not None and not future.done():
+                        future.set_result(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("serving listener disconnected, retrying")
+                await asyncio.sleep(self.retry_delay)
+            finally:
+                await pubsub.aclose()
+
+
+serving_listener = ServingListener()